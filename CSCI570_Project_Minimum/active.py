@@ -0,0 +1,33 @@
+"""
+Instances made current by a with-block.
+
+Engines find the phase timer, the recursion tracer and the progress
+reporter without having them passed down through every call: entering one
+makes it the current instance of its class until the block ends, when
+whichever instance was current before is restored, so blocks nest.
+"""
+
+
+class ActiveContext:
+    """Base class whose instances are cls.active() inside their with-block."""
+
+    _current = None
+
+    @classmethod
+    def active(cls):
+        """The instance of the innermost enclosing with-block, or None."""
+        return cls._current
+
+    @classmethod
+    def deactivate(cls):
+        """Forget the current instance, e.g. in a forked worker process."""
+        cls._current = None
+
+    def __enter__(self):
+        cls = type(self)
+        self._previous, cls._current = cls._current, self
+        return self
+
+    def __exit__(self, *exc_info):
+        type(self)._current = self._previous
+        return False
@@ -0,0 +1,218 @@
+"""
+Run-length edit operations describing an alignment.
+
+An alignment is a list of [op, count] runs read left to right:
+    MATCH  X[i] lined up with Y[j] (match or mismatch)
+    GAP_X  Y[j] lined up with a gap in X
+    GAP_Y  X[i] lined up with a gap in Y
+The letters follow CIGAR with X as the reference (M, I, D).
+"""
+import os.path
+import re
+from itertools import groupby
+
+MATCH, GAP_X, GAP_Y = 'M', 'I', 'D'
+
+GAP = ord('_')
+
+# characters per write when streaming an aligned row
+CHUNK_SIZE = 1 << 16
+
+
+def append_op(ops, op, count=1):
+    """Append count copies of op, merging with the last run."""
+    if ops and ops[-1][0] == op:
+        ops[-1][1] += count
+    else:
+        ops.append([op, count])
+
+
+def extend_ops(ops, more):
+    """Append a whole run list, merging the runs that meet in the middle."""
+    if more:
+        append_op(ops, more[0][0], more[0][1])
+        ops.extend(run[:] for run in more[1:])
+
+
+def materialize(ops, x_codes, y_codes, alphabet, xlo=0, ylo=0) -> tuple[str, str]:
+    """
+    Build the two gapped strings for ops in a single pass.
+    The runs walk x_codes from xlo and y_codes from ylo.
+    """
+    table = bytes.maketrans(bytes(range(len(alphabet))), alphabet.encode('ascii'))
+    pieces_x = []
+    pieces_y = []
+
+    i, j = xlo, ylo
+    for op, count in ops:
+        if op == MATCH:
+            pieces_x.append(bytes(x_codes[i:i + count]))
+            pieces_y.append(bytes(y_codes[j:j + count]))
+            i += count
+            j += count
+        elif op == GAP_X:
+            pieces_x.append(bytes([GAP]) * count)
+            pieces_y.append(bytes(y_codes[j:j + count]))
+            j += count
+        else:
+            pieces_x.append(bytes(x_codes[i:i + count]))
+            pieces_y.append(bytes([GAP]) * count)
+            i += count
+
+    aligned_x = b''.join(pieces_x).translate(table).decode('ascii')
+    aligned_y = b''.join(pieces_y).translate(table).decode('ascii')
+
+    return aligned_x, aligned_y
+
+
+def iter_row(ops, codes, gap_op, alphabet, start=0, chunk_size=CHUNK_SIZE):
+    """
+    Yield one gapped row in chunks of at most chunk_size characters.
+    codes is the sequence shown in the row and gap_op the op that puts a gap
+    in it (GAP_X for the X row, GAP_Y for the Y row).
+    """
+    table = bytes.maketrans(bytes(range(len(alphabet))), alphabet.encode('ascii'))
+    pending = bytearray()
+
+    i = start
+    for op, count in ops:
+        while count:
+            take = min(count, chunk_size - len(pending))
+            if op == gap_op:
+                pending += bytes([GAP]) * take
+            else:
+                pending += codes[i:i + take]
+                i += take
+            count -= take
+
+            if len(pending) == chunk_size:
+                yield pending.translate(table).decode('ascii')
+                pending = bytearray()
+
+    if pending:
+        yield pending.translate(table).decode('ascii')
+
+
+def ops_from_moves(moves) -> list:
+    """Run-length encode single moves that a traceback collected back to front."""
+    return [[op, sum(1 for _ in run)] for op, run in groupby(reversed(moves))]
+
+
+def ops_from_cigar(cigar) -> list:
+    """Parse a CIGAR string written by Alignment.cigar() back into runs."""
+    return [[op, int(count)] for count, op in re.findall(r"(\d+)([MID])", cigar)]
+
+
+class Alignment:
+    """
+    Alignment of two encoded sequences backed by a run-length op list.
+    The gapped strings are only built when first asked for, and the cost is
+    recomputed from the ops when the engine did not supply it. Unpacks and
+    indexes like the (cost, aligned_x, aligned_y) tuples the engines used to
+    return.
+    """
+
+    def __init__(self, ops, x_codes, y_codes, alphabet, delta, costs, cost=None):
+        self.ops = ops
+        self.x_codes = x_codes
+        self.y_codes = y_codes
+        self.alphabet = alphabet
+        self.delta = delta
+        self.costs = costs
+        self._cost = cost
+        self._strings = None
+
+    @property
+    def cost(self) -> int:
+        if self._cost is None:
+            self._cost = self.score()
+        return self._cost
+
+    @property
+    def aligned_x(self) -> str:
+        return self.strings()[0]
+
+    @property
+    def aligned_y(self) -> str:
+        return self.strings()[1]
+
+    def strings(self) -> tuple[str, str]:
+        """Both gapped strings, materialized once and cached."""
+        if self._strings is None:
+            self._strings = materialize(self.ops, self.x_codes, self.y_codes, self.alphabet)
+        return self._strings
+
+    def score(self) -> int:
+        """Cost of the alignment recomputed from the ops alone."""
+        total = 0
+        i, j = 0, 0
+        for op, count in self.ops:
+            if op == MATCH:
+                for k in range(count):
+                    total += self.costs[self.x_codes[i + k]][self.y_codes[j + k]]
+                i += count
+                j += count
+            else:
+                total += count * self.delta
+                if op == GAP_X:
+                    j += count
+                else:
+                    i += count
+        return total
+
+    def cigar(self) -> str:
+        """The op list as a CIGAR string, e.g. 3M1I2M."""
+        return ''.join(f"{count}{op}" for op, count in self.ops)
+
+    def __iter__(self):
+        yield self.cost
+        yield from self.strings()
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.cost
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (Alignment, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Alignment(cost={self.cost}, cigar={self.cigar()!r})"
+
+
+def format_cigar_output(output_path, cost, cigar, time_ms, memory_kb):
+    """
+    Write alignment results in the compact layout: cost, CIGAR string,
+    time and memory, one per line.
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    with open(output_path, "w") as f:
+        f.write(f"{cost}\n")
+        f.write(f"{cigar}\n")
+        f.write(f"{time_ms}\n")
+        f.write(f"{memory_kb}\n")
+
+
+def write_alignment_output(output_path, cost, alignment, time_ms, memory_kb, chunk_size=CHUNK_SIZE):
+    """
+    Write alignment results in the five-line layout of basic.format_output,
+    streaming each gapped row from the op list in chunk_size pieces so
+    neither row is ever held in memory whole.
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    with open(output_path, "w") as f:
+        f.write(f"{cost}\n")
+        for codes, gap_op in ((alignment.x_codes, GAP_X), (alignment.y_codes, GAP_Y)):
+            for chunk in iter_row(alignment.ops, codes, gap_op, alignment.alphabet, chunk_size=chunk_size):
+                f.write(chunk)
+            f.write("\n")
+        f.write(f"{time_ms}\n")
+        f.write(f"{memory_kb}\n")
@@ -0,0 +1,120 @@
+from array import array
+
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, ops_from_moves
+from encoding import cost_matrix, encode
+from phases import count, phase
+from progress import ProgressReporter, expect
+
+
+def banded_fill(x_codes, y_codes, delta, costs, k) -> list[array]:
+    """
+    Fill the DP table restricted to the diagonals |i - j| <= k.
+    Row i holds the cells j = max(0, i - k) .. min(n, i + k); cells outside
+    the band are treated as unreachable. Each fill counts its band's cells
+    and adds them to the progress total, so a widened band's refill extends
+    the ETA.
+    """
+    m, n = len(x_codes), len(y_codes)
+
+    cells = sum(min(n, i + k) - max(1, i - k) + 1 for i in range(1, m + 1))
+    count('cells', cells)
+    expect(cells)
+    reporter = ProgressReporter.active()
+
+    rows = [array('q', [j * delta for j in range(min(n, k) + 1)])]
+
+    for i in range(1, m + 1):
+        lo, hi = max(0, i - k), min(n, i + k)
+        prev_lo, prev_hi = max(0, i - 1 - k), min(n, i - 1 + k)
+        prev = rows[i - 1]
+        curr = array('q', [0]) * (hi - lo + 1)
+        row_costs = costs[x_codes[i - 1]]
+
+        left = None
+        for j in range(lo, hi + 1):
+            if j == 0:
+                best = i * delta
+            else:
+                # the diagonal neighbour is always inside the band
+                best = prev[j - 1 - prev_lo] + row_costs[y_codes[j - 1]]
+                if j <= prev_hi and prev[j - prev_lo] + delta < best:
+                    best = prev[j - prev_lo] + delta
+                if left is not None and left + delta < best:
+                    best = left + delta
+            curr[j - lo] = left = best
+
+        rows.append(curr)
+        if reporter:
+            reporter.advance(hi - max(1, lo) + 1)
+
+    return rows
+
+
+def banded_alignment(X, Y, delta, alpha, band=16) -> Alignment:
+    """
+    Sequence alignment that only fills the diagonals |i - j| <= k, doubling k
+    until the banded cost is provably optimal.
+    Any path that leaves the band needs at least 2(k + 1) - |m - n| gaps, so
+    once the banded cost is strictly below that many gap penalties no better
+    (or equally good) alignment can exist outside the band and the traceback
+    is the same diagonal > left > up one as basic.sequence_alignment.
+    Time and memory are O((m + n) * k).
+    """
+    m, n = len(X), len(Y)
+
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    k = max(abs(m - n), band, 1)
+    # the gap-count bound only holds when no pair can have a negative cost
+    if min(min(row) for row in costs) < 0:
+        k = max(m, n)
+
+    while True:
+        k = min(k, max(m, n))
+        with phase('fill'):
+            rows = banded_fill(x_codes, y_codes, delta, costs, k)
+        minimum_alignment_cost = rows[m][n - max(0, m - k)]
+
+        if k >= max(m, n) or minimum_alignment_cost < delta * (2 * (k + 1) - abs(m - n)):
+            break
+        k *= 2
+
+    def value(i, j):
+        lo = max(0, i - k)
+        if j < lo or j > min(n, i + k):
+            return None
+        return rows[i][j - lo]
+
+    # moves are found back to front
+    moves = []
+
+    with phase('traceback'):
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i == 0:
+                moves.append(GAP_X)
+                j -= 1
+            elif j == 0:
+                moves.append(GAP_Y)
+                i -= 1
+            else:
+                current = value(i, j)
+                left = value(i, j - 1)
+
+                # Diagonal
+                if current == value(i - 1, j - 1) + costs[x_codes[i - 1]][y_codes[j - 1]]:
+                    moves.append(MATCH)
+                    i -= 1
+                    j -= 1
+                # Left
+                elif left is not None and current == left + delta:
+                    moves.append(GAP_X)
+                    j -= 1
+                # Up
+                else:
+                    moves.append(GAP_Y)
+                    i -= 1
+
+    return Alignment(ops_from_moves(moves), x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
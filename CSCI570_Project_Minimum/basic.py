@@ -1,9 +1,27 @@
+import argparse
+import functools
 import os.path
 import sys
 import time
 import psutil
+from array import array
 from pathlib import Path
 
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, format_cigar_output, ops_from_moves, write_alignment_output
+from banded import banded_alignment
+from cache import ResultCache
+from checkpoint import checkpoint_alignment
+from encoding import cost_matrix, encode
+from four_russians import four_russians_alignment
+from memory import MEMORY_MODES, MemoryMonitor
+from metrics import write_metrics
+from packed import packed_alignment
+from phases import PhaseTimer, count, phase
+from progress import PROGRESS_FORMATS, ProgressReporter, expect
+from repeats import repeat_alignment
+from sequence import VirtualSequence
+from wavefront import wavefront_alignment
+
 # Constants
 DELTA = 30
 ALPHA = {
@@ -28,7 +46,12 @@ def generate_string(base_string, indices):
 def parse_input_file(file_path):
 
     with open(file_path, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
+        return parse_input_spec(f.read())
+
+
+def parse_input_spec(text):
+    """Parse input file contents (base strings and insertion indices)."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
 
     string1 = lines[0]
     idx=1
@@ -46,76 +69,86 @@ def parse_input_file(file_path):
         indices2.append(int(lines[idx]))
         idx += 1
 
-    output_string1 = generate_string(string1, indices1)
-    output_string2 = generate_string(string2, indices2)
+    # generated lazily, see sequence.VirtualSequence
+    output_string1 = VirtualSequence(string1, indices1)
+    output_string2 = VirtualSequence(string2, indices2)
 
     return output_string1, output_string2
 
 
-def sequence_alignment(X, Y, delta, alpha):
+def sequence_alignment(X, Y, delta, alpha) -> Alignment:
     """
     Perform sequence alignment using dynamic programming.
     Traceback priority: diagonal > left > up [Bois this should be same for all]
     """
     m, n = len(X), len(Y)
 
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-
-    # base cases
-    for i in range(m + 1):
-        dp[i][0] = i * delta
-
-    for j in range(n + 1):
-        dp[0][j] = j * delta
-
-    # dp table
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-
-            dp[i][j] = min(dp[i - 1][j - 1] + alpha[X[i - 1], Y[j - 1]],
-                           dp[i - 1][j] + delta,
-                           dp[i][j - 1] + delta)
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    expect(m * n)
+    reporter = ProgressReporter.active()
+
+    with phase('fill'):
+        dp = [array('q', [0]) * (n + 1) for _ in range(m + 1)]
+
+        # base cases
+        for i in range(m + 1):
+            dp[i][0] = i * delta
+
+        for j in range(n + 1):
+            dp[0][j] = j * delta
+
+        # dp table
+        for i in range(1, m + 1):
+            prev, curr = dp[i - 1], dp[i]
+            row_costs = costs[x_codes[i - 1]]
+            left = curr[0]
+            for j in range(1, n + 1):
+                best = prev[j - 1] + row_costs[y_codes[j - 1]]
+                if prev[j] + delta < best:
+                    best = prev[j] + delta
+                if left + delta < best:
+                    best = left + delta
+                curr[j] = left = best
+            if reporter:
+                reporter.advance(n)
+        count('cells', m * n)
 
     minimum_alignment_cost = dp[m][n]
 
-    aligned_x = []
-    aligned_y = []
-
-    i, j = m, n
-    while i > 0 or j > 0:
-        if i == 0:
-            aligned_x.append('_')
-            aligned_y.append(Y[j - 1])
-            j -= 1
-        elif j == 0:
-            aligned_x.append(X[i - 1])
-            aligned_y.append('_')
-            i -= 1
-        else:
-            match_cost = dp[i - 1][j - 1] + alpha[X[i - 1], Y[j - 1]]
-            insert_cost = dp[i][j - 1] + delta
+    # moves are found back to front
+    moves = []
 
-            # Diagonal
-            if dp[i][j] == match_cost:
-                aligned_x.append(X[i - 1])
-                aligned_y.append(Y[j - 1])
-                i -= 1
+    with phase('traceback'):
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i == 0:
+                moves.append(GAP_X)
                 j -= 1
-            # Left
-            elif dp[i][j] == insert_cost:
-                aligned_x.append('_')
-                aligned_y.append(Y[j - 1])
-                j -= 1
-            # Up
-            else:
-                aligned_x.append(X[i - 1])
-                aligned_y.append('_')
+            elif j == 0:
+                moves.append(GAP_Y)
                 i -= 1
-
-    aligned_x.reverse()
-    aligned_y.reverse()
-
-    return minimum_alignment_cost, ''.join(aligned_x), ''.join(aligned_y)
+            else:
+                match_cost = dp[i - 1][j - 1] + costs[x_codes[i - 1]][y_codes[j - 1]]
+                insert_cost = dp[i][j - 1] + delta
+
+                # Diagonal
+                if dp[i][j] == match_cost:
+                    moves.append(MATCH)
+                    i -= 1
+                    j -= 1
+                # Left
+                elif dp[i][j] == insert_cost:
+                    moves.append(GAP_X)
+                    j -= 1
+                # Up
+                else:
+                    moves.append(GAP_Y)
+                    i -= 1
+
+    return Alignment(ops_from_moves(moves), x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
 
 
 def calculate_alignment_cost(aligned1, aligned2, delta, alpha):
@@ -153,33 +186,119 @@ def format_output(output_path, cost, aligned1, aligned2, time_ms, memory_kb):
         f.write(f"{memory_kb}\n")
 
 
-def main():
-    if len(sys.argv) !=3:
-        print("Expected python3/py basic.py <input_file> <output_file>")
-        sys.exit(1)
+# Alignment engines selectable with --engine, all share the
+# (X, Y, delta, alpha) -> Alignment signature
+ENGINES = {
+    'dp': sequence_alignment,
+    'wavefront': wavefront_alignment,
+    'packed': packed_alignment,
+    'banded': banded_alignment,
+    'checkpoint': checkpoint_alignment,
+    'four-russians': four_russians_alignment,
+    'repeats': repeat_alignment,
+}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Basic sequence alignment")
+    parser.add_argument("input_file")
+    parser.add_argument("output_file")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default='dp',
+                        help="DP engine used to fill the table (default: dp)")
+    parser.add_argument("--checkpoint-interval", type=int, default=None,
+                        help="rows between stored checkpoints for --engine checkpoint "
+                             "(default: sqrt of the first string's length)")
+    parser.add_argument("--format", choices=['text', 'cigar'], default='text',
+                        help="write the two gapped strings (text) or one run-length CIGAR line "
+                             "(default: text)")
+    parser.add_argument("--memory", choices=MEMORY_MODES, default='peak',
+                        help="memory line of the output: peak RSS added by the alignment (peak), "
+                             "tracemalloc peak, slower (traced), or RSS after the run (rss) "
+                             "(default: peak)")
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="write per-phase timings and cell counts as JSON (default: off)")
+    parser.add_argument("--cache", default=None, metavar="PATH",
+                        help="SQLite file caching results by input, scoring and engine (default: off)")
+    parser.add_argument("--progress", choices=sorted(PROGRESS_FORMATS), default=None,
+                        help="report cells done and ETA on stderr as a status line (text) or JSON lines "
+                             "(json) (default: off)")
+    return parser.parse_args(argv)
+
+
+def engine_name(args) -> str:
+    """Name of the aligner make_aligner builds; the cache key and the metrics sidecar's engine."""
+    return f"basic:{args.engine}"
+
+
+def make_aligner(args, cache=None):
+    """
+    The (X, Y, delta, alpha) alignment function selected by parsed CLI args.
+    With --cache it goes through cache, an open ResultCache of that file, or
+    a new one if cache is None.
+    """
+    align = ENGINES[args.engine]
+    if args.engine == 'checkpoint':
+        align = functools.partial(align, interval=args.checkpoint_interval)
+    if args.cache:
+        align = (cache or ResultCache(args.cache)).cached(align, engine_name(args))
+    return align
 
-    input_path = sys.argv[1]
-    output_path = sys.argv[2]
 
-    string1, string2 = parse_input_file(input_path)
+def run(input_path, output_path, align, output_format='text', memory_mode='peak', profile_path=None,
+        engine=None, delta=DELTA, alpha=ALPHA):
+    """
+    Align one input file with the given scoring and write its output file
+    plus its metrics sidecar (see metrics.py). With profile_path the phase
+    timings (see phases.PhaseTimer) are written there as JSON.
+    """
+    with PhaseTimer() as timer:
+        with phase('parse'):
+            string1, string2 = parse_input_file(input_path)
+
+        # memory of the alignment phase alone, see memory.MemoryMonitor
+        with MemoryMonitor(trace=memory_mode == 'traced') as monitor:
+            # Start
+            start_time = time.time()
+
+            # main function basic approach
+            with phase('align'):
+                alignment = align(string1, string2, delta, alpha)
+
+            with phase('verify'):
+                cost = alignment.score()
+            # End
+            end_time = time.time()
+            time_ms = (end_time - start_time) * 1000
+
+        memory = monitor.value(memory_mode)
+
+        with phase('write'):
+            if output_format == 'cigar':
+                format_cigar_output(output_path, cost, alignment.cigar(), time_ms, memory)
+            else:
+                write_alignment_output(output_path, cost, alignment, time_ms, memory)
 
-    # Start
-    start_time = time.time()
+    write_metrics(output_path, engine=engine, input=input_path, format=output_format,
+                  m=len(string1), n=len(string2), aligned_length=sum(length for _, length in alignment.ops),
+                  cost=cost, time_ms=time_ms, memory_kb=memory, memory_mode=memory_mode,
+                  memory=monitor.report(), phases_ms=timer.to_dict()['phases_ms'])
 
-    # main function basic approach
-    min_cost, aligned1, aligned2 = sequence_alignment(string1, string2, DELTA, ALPHA)
+    if profile_path:
+        timer.write(profile_path, input=input_path, output=output_path, m=len(string1), n=len(string2),
+                    time_ms=time_ms, memory_kb=memory, memory=monitor.report())
 
-    cost = calculate_alignment_cost(aligned1, aligned2, DELTA, ALPHA)
-    # End
-    end_time = time.time()
-    time_ms = (end_time - start_time) * 1000
 
-    # memory usage
-    memory = process_memory()
+def main():
+    args = parse_args(sys.argv[1:])
+    if not args.progress:
+        run(args.input_file, args.output_file, make_aligner(args), args.format, args.memory, args.profile,
+            engine_name(args))
+        return
 
-    format_output(output_path, cost, aligned1, aligned2, time_ms, memory)
-    pass
+    with ProgressReporter(PROGRESS_FORMATS[args.progress]):
+        run(args.input_file, args.output_file, make_aligner(args), args.format, args.memory, args.profile,
+            engine_name(args))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
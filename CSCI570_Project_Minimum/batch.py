@@ -0,0 +1,132 @@
+"""
+Align a whole directory (or glob) of input files in one process pool.
+
+    python batch.py CSCI570_Project_Minimum_Jul_14/Datapoints Output --mode efficient
+
+Every inputN.txt / inN.txt becomes output<name> in the output directory,
+written by the same run() as the single-file basic.py / efficient.py CLI.
+Options the batch parser does not know (--engine, --format, ...) are passed
+on to that CLI's parser. Jobs are dispatched largest first so the longest
+alignment starts right away, and worker processes are reused across jobs, so
+the interpreter and the engines are only loaded once per worker. --profile
+and --trace write one file per input, named after the input (p.json becomes
+p.in1.json), and --progress reports are tagged with the input. The memory
+line only covers each job's alignment phase (see memory.MemoryMonitor), but
+a warm worker may reuse memory freed by its previous job, so run with
+--jobs equal to the number of files for isolated peaks.
+"""
+import argparse
+import glob
+import os
+import os.path
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+
+import basic
+import efficient
+from progress import PROGRESS_FORMATS, ProgressReporter
+from recursion_trace import RecursionTracer
+
+MODES = {'basic': basic, 'efficient': efficient}
+
+
+def find_inputs(pattern) -> list[str]:
+    """Input files named by a directory (every in*.txt in it) or a glob."""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "in*.txt")
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def output_path_for(input_path, output_dir) -> str:
+    return os.path.join(output_dir, "output" + os.path.basename(input_path))
+
+
+def job_size(input_path) -> int:
+    """Number of DP cells of an input, read from its spec without generating it."""
+    string1, string2 = basic.parse_input_file(input_path)
+    return len(string1) * len(string2)
+
+
+def per_input_path(path, input_path) -> str:
+    """path with the input's name before its extension, e.g. p.json -> p.in1.json."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.path.splitext(os.path.basename(input_path))[0]}{ext}"
+
+
+def tagged(callback, input_path):
+    """Progress callback adding the input's name to every report."""
+    name = os.path.basename(input_path)
+    return lambda report: callback({'input': name, **report})
+
+
+def run_job(mode, cli_args, input_path, output_path) -> tuple[str, float]:
+    """Run one input through the mode's CLI in a worker; returns its wall time in ms."""
+    module = MODES[mode]
+    args = module.parse_args([input_path, output_path, *cli_args])
+    profile_path = args.profile and per_input_path(args.profile, input_path)
+    trace_path = getattr(args, 'trace', None)
+
+    with ExitStack() as stack:
+        if trace_path:
+            stack.enter_context(RecursionTracer(per_input_path(trace_path, input_path)))
+        if args.progress:
+            stack.enter_context(ProgressReporter(tagged(PROGRESS_FORMATS[args.progress], input_path)))
+
+        start_time = time.time()
+        module.run(input_path, output_path, module.make_aligner(args), args.format, args.memory, profile_path,
+                   engine=module.engine_name(args))
+    return input_path, (time.time() - start_time) * 1000
+
+
+def run_batch(inputs, output_dir, mode='basic', cli_args=(), jobs=None) -> list[tuple[str, float]]:
+    """
+    Align every input file on a pool of jobs processes, largest first.
+    Returns (input_path, wall time in ms) in completion order.
+    """
+    # validate the forwarded options once, before any worker starts
+    MODES[mode].parse_args(["input", "output", *cli_args])
+
+    os.makedirs(output_dir, exist_ok=True)
+    inputs = sorted(inputs, key=job_size, reverse=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_job, mode, list(cli_args), input_path, output_path_for(input_path, output_dir))
+                   for input_path in inputs]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    return results
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Align a directory of input files on a process pool",
+        epilog="other options are passed on to basic.py / efficient.py")
+    parser.add_argument("inputs", help="directory of in*.txt files or a glob pattern")
+    parser.add_argument("output_dir")
+    parser.add_argument("--mode", choices=sorted(MODES), default='basic',
+                        help="which CLI handles each file (default: basic)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    return parser.parse_known_args(argv)
+
+
+def main():
+    args, cli_args = parse_args(sys.argv[1:])
+
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        print(f"No input files match {args.inputs!r}", file=sys.stderr)
+        sys.exit(1)
+
+    start_time = time.time()
+    for input_path, time_ms in run_batch(inputs, args.output_dir, args.mode, cli_args, args.jobs):
+        print(f"{os.path.basename(input_path)}: {time_ms:.1f} ms")
+    print(f"{len(inputs)} files in {(time.time() - start_time) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Scaling benchmark for every alignment engine.
+
+    python benchmark.py --max-size 1024 --repeats 5 --output benchmark.json
+
+Inputs are generated like the project's inputs (a random base string
+doubled by random insertions) for square sizes on a power-of-two grid.
+Each engine of basic.ENGINES and efficient.ENGINES, plus
+efficient:parallel (parallel_hirschberg on --workers processes), runs
+warmups + repeats times per size; wall and CPU time of every repeat are
+recorded along with the medians and cells per second. Peak memory
+(tracemalloc peak and peak RSS above baseline) comes from one extra,
+untimed run, so tracing never slows the timed repeats; for
+efficient:parallel it covers the parent process only, and CPU time
+excludes the workers.
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import basic
+import efficient
+from basic import DELTA, ALPHA
+from memory import MemoryMonitor
+from sequence import VirtualSequence
+
+# leaf size of efficient:parallel, small enough to split the grid's inputs
+PARALLEL_CELL_BUDGET = 16384
+
+ENGINES = {
+    **{f"basic:{name}": align for name, align in basic.ENGINES.items()},
+    **{f"efficient:{name}": align for name, align in efficient.ENGINES.items()},
+    'efficient:parallel': functools.partial(efficient.parallel_hirschberg, cell_budget=PARALLEL_CELL_BUDGET),
+}
+
+# largest base string of a generated input
+BASE_LENGTH = 8
+
+
+def make_sequence(size, rng) -> VirtualSequence:
+    """Random generated sequence of a power-of-two length."""
+    base_length = min(size, BASE_LENGTH)
+    base = ''.join(rng.choice("ACGT") for _ in range(base_length))
+
+    indices = []
+    length = base_length
+    while length < size:
+        indices.append(rng.randrange(length))
+        length *= 2
+
+    return VirtualSequence(base, indices)
+
+
+def size_grid(min_size, max_size) -> list[int]:
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= 2
+    return sizes
+
+
+def measure(align, X, Y, warmups=1, repeats=5) -> dict:
+    """Time one engine on one input and trace the peak allocation of one more run."""
+    for _ in range(warmups):
+        align(X, Y, DELTA, ALPHA)
+
+    wall, cpu = [], []
+    for _ in range(repeats):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        alignment = align(X, Y, DELTA, ALPHA)
+        wall.append(time.perf_counter() - wall_start)
+        cpu.append(time.process_time() - cpu_start)
+
+    with MemoryMonitor(trace=True) as monitor:
+        align(X, Y, DELTA, ALPHA)
+
+    cells = len(X) * len(Y)
+    wall_median = statistics.median(wall)
+    return {
+        'cost': alignment.cost,
+        'cells': cells,
+        'wall_s': wall,
+        'cpu_s': cpu,
+        'wall_median_s': wall_median,
+        'cpu_median_s': statistics.median(cpu),
+        'peak_kb': monitor.traced_peak_kb,
+        'peak_rss_delta_kb': monitor.peak_delta_kb,
+        'cells_per_s': cells / wall_median if wall_median else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(engines, sizes, warmups=1, repeats=5, seed=570, max_cells=None, log=None,
+                  workers=None) -> dict:
+    """
+    Benchmark every engine on every size; returns the JSON-ready results.
+    workers is the pool size of efficient:parallel (default: CPU count).
+    """
+    workers = workers or os.cpu_count() or 1
+    results = []
+    for size in sizes:
+        rng = random.Random(seed + size)
+        X, Y = make_sequence(size, rng), make_sequence(size, rng)
+        if max_cells is not None and len(X) * len(Y) > max_cells:
+            continue
+
+        for name in engines:
+            align = ENGINES[name]
+            if name == 'efficient:parallel':
+                align = functools.partial(align, workers=workers)
+            result = {'engine': name, 'm': len(X), 'n': len(Y),
+                      **measure(align, X, Y, warmups, repeats)}
+            results.append(result)
+            if log:
+                log(f"{name:24} {size:>7} x {size:<7} {result['wall_median_s'] * 1000:10.2f} ms "
+                    f"{result['cells_per_s'] or 0:14.0f} cells/s {result['peak_kb']:12.1f} KB")
+
+    return {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'workers': workers,
+            'warmups': warmups,
+            'repeats': repeats,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark alignment engines over a size grid")
+    parser.add_argument("--engines", nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES),
+                        metavar="ENGINE", help=f"engines to run (default: all of {', '.join(sorted(ENGINES))})")
+    parser.add_argument("--min-size", type=int, default=64, help="smallest m = n (default: 64)")
+    parser.add_argument("--max-size", type=int, default=1024, help="largest m = n (default: 1024)")
+    parser.add_argument("--max-cells", type=int, default=None, help="skip inputs with more DP cells")
+    parser.add_argument("--warmups", type=int, default=1, help="untimed runs per input (default: 1)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per input (default: 5)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes of efficient:parallel (default: number of CPUs)")
+    parser.add_argument("--seed", type=int, default=570)
+    parser.add_argument("--output", default="benchmark.json", help="results file (default: benchmark.json)")
+    args = parser.parse_args(argv)
+    if args.repeats < 1:
+        parser.error("--repeats needs at least one timed run")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers needs at least one process")
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    report = run_benchmark(args.engines, size_grid(args.min_size, args.max_size), args.warmups, args.repeats,
+                           args.seed, args.max_cells, log=print, workers=args.workers)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Content-addressed on-disk cache of alignment results.
+
+Results are keyed by a SHA-256 of the two sequences (their (base, indices)
+spec for a VirtualSequence), DELTA, ALPHA and the engine, and stored in a
+SQLite file as the cost plus the CIGAR string of the alignment. The store
+is capped at max_bytes of CIGAR text; the least recently used entries are
+evicted first.
+"""
+import argparse
+import hashlib
+import json
+import os.path
+import sqlite3
+import sys
+import time
+
+from alignment import Alignment, ops_from_cigar
+from encoding import cost_matrix, encode
+from sequence import VirtualSequence
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def sequence_digest(seq) -> bytes:
+    if isinstance(seq, VirtualSequence):
+        return repr((seq.base, seq.indices)).encode()
+    return hashlib.sha256(str(seq).encode('ascii')).digest()
+
+
+def cache_key(X, Y, delta, alpha, engine) -> str:
+    """Hex digest identifying one alignment problem solved by one engine."""
+    h = hashlib.sha256()
+    for part in (sequence_digest(X), sequence_digest(Y),
+                 repr(delta).encode(), repr(sorted(alpha.items())).encode(), engine.encode()):
+        # length-prefixed so parts cannot run into each other
+        h.update(len(part).to_bytes(8, 'little'))
+        h.update(part)
+    return h.hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed LRU cache of alignments with hit and miss counters."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.db = sqlite3.connect(path, timeout=30)
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS results ("
+                            "key TEXT PRIMARY KEY, cost INTEGER, cigar TEXT, size INTEGER, last_used REAL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            # lifetime counters shared by every process using the file
+            self.db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+            self.db.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    def get(self, key, X, Y, delta, alpha):
+        """The cached Alignment for key, or None."""
+        row = self.db.execute("SELECT cost, cigar FROM results WHERE key = ?", (key,)).fetchone()
+        with self.db:
+            self.db.execute("UPDATE counters SET value = value + 1 WHERE name = ?",
+                            ('misses' if row is None else 'hits',))
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+
+        cost, cigar = row
+        alphabet, costs = cost_matrix(alpha)
+        return Alignment(ops_from_cigar(cigar), encode(X, alphabet), encode(Y, alphabet), alphabet, delta, costs,
+                         cost)
+
+    def put(self, key, alignment):
+        """Store an alignment, then evict least recently used entries over max_bytes."""
+        cigar = alignment.cigar()
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                            (key, alignment.cost, cigar, len(cigar), time.time()))
+            self.evict()
+
+    def evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self.db.execute("SELECT key, size FROM results ORDER BY last_used")
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM results WHERE key = ?", stale)
+
+    def cached(self, align, engine):
+        """Wrap an (X, Y, delta, alpha) engine so results go through the cache."""
+
+        def cached_align(X, Y, delta, alpha) -> Alignment:
+            key = cache_key(X, Y, delta, alpha, engine)
+            alignment = self.get(key, X, Y, delta, alpha)
+            if alignment is None:
+                alignment = align(X, Y, delta, alpha)
+                self.put(key, alignment)
+            return alignment
+
+        return cached_align
+
+    def stats(self) -> dict:
+        """Hits and misses of this instance, lifetime totals of the file and its size."""
+        entries, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        totals = dict(self.db.execute("SELECT name, value FROM counters"))
+        return {'hits': self.hits, 'misses': self.misses,
+                'total_hits': totals['hits'], 'total_misses': totals['misses'],
+                'entries': entries, 'bytes': size}
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM results")
+            self.db.execute("UPDATE counters SET value = 0")
+
+    def close(self):
+        self.db.close()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Inspect or clear an alignment result cache")
+    parser.add_argument("path")
+    parser.add_argument("--clear", action='store_true', help="drop every entry and reset the counters")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    cache = ResultCache(args.path)
+    if args.clear:
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from array import array
+from math import isqrt
+
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, ops_from_moves
+from encoding import cost_matrix, encode
+from phases import count, phase
+from progress import ProgressReporter, expect
+
+
+def next_row(prev, i, x_code, y_codes, delta, costs) -> array:
+    """Compute DP row i from row i - 1."""
+    n = len(y_codes)
+    curr = array('q', [0]) * (n + 1)
+    row_costs = costs[x_code]
+
+    left = curr[0] = i * delta
+    for j in range(1, n + 1):
+        best = prev[j - 1] + row_costs[y_codes[j - 1]]
+        if prev[j] + delta < best:
+            best = prev[j] + delta
+        if left + delta < best:
+            best = left + delta
+        curr[j] = left = best
+
+    return curr
+
+
+def checkpoint_alignment(X, Y, delta, alpha, interval=None) -> Alignment:
+    """
+    Sequence alignment that keeps every interval-th DP row during the forward
+    pass and recomputes one block of rows at a time from those checkpoints
+    during traceback.
+    With the default interval of ~sqrt(m) memory is O(n * sqrt(m)) for about
+    twice the cell work of the basic DP and no recursion. Smaller intervals
+    trade memory for speed. Same diagonal > left > up traceback as
+    basic.sequence_alignment.
+    """
+    m, n = len(X), len(Y)
+
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    if interval is None:
+        interval = isqrt(m)
+    interval = max(1, interval)
+
+    # the traceback recomputes every row once more
+    expect(2 * m * n)
+    reporter = ProgressReporter.active()
+
+    # forward pass, keeping rows 0, interval, 2 * interval, ...
+    with phase('fill'):
+        row = array('q', [j * delta for j in range(n + 1)])
+        checkpoints = [row]
+        for i in range(1, m + 1):
+            row = next_row(row, i, x_codes[i - 1], y_codes, delta, costs)
+            if i % interval == 0:
+                checkpoints.append(row)
+            if reporter:
+                reporter.advance(n)
+        count('cells', m * n)
+
+    minimum_alignment_cost = row[n]
+
+    # moves are found back to front
+    moves = []
+
+    with phase('traceback'):
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i == 0:
+                moves.append(GAP_X)
+                j -= 1
+                continue
+
+            # recompute rows top..i of the block holding row i
+            top = (i - 1) // interval * interval
+            with phase('recompute'):
+                block = [checkpoints[top // interval]]
+                for r in range(top + 1, i + 1):
+                    block.append(next_row(block[-1], r, x_codes[r - 1], y_codes, delta, costs))
+                    if reporter:
+                        reporter.advance(n)
+                count('cells', (i - top) * n)
+
+            while i > top:
+                curr, prev = block[i - top], block[i - top - 1]
+                if j == 0:
+                    moves.append(GAP_Y)
+                    i -= 1
+                # Diagonal
+                elif curr[j] == prev[j - 1] + costs[x_codes[i - 1]][y_codes[j - 1]]:
+                    moves.append(MATCH)
+                    i -= 1
+                    j -= 1
+                # Left
+                elif curr[j] == curr[j - 1] + delta:
+                    moves.append(GAP_X)
+                    j -= 1
+                # Up
+                else:
+                    moves.append(GAP_Y)
+                    i -= 1
+
+    return Alignment(ops_from_moves(moves), x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
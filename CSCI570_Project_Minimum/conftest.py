@@ -0,0 +1,17 @@
+import random
+
+import pytest
+
+
+@pytest.fixture
+def random_pairs():
+    """Reproducible random DNA string pairs for comparing engines."""
+
+    def pairs(seed, count=20, max_length=30):
+        rng = random.Random(seed)
+        for _ in range(count):
+            string1 = ''.join(rng.choice("ACGT") for _ in range(rng.randint(1, max_length)))
+            string2 = ''.join(rng.choice("ACGT") for _ in range(rng.randint(1, max_length)))
+            yield string1, string2
+
+    return pairs
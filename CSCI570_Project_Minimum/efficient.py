@@ -1,8 +1,24 @@
+import argparse
+import functools
 import os.path
 import sys
 import time
 import psutil
 import math
+from array import array
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import basic
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, append_op, extend_ops
+from basic import parse_input_file
+from cache import ResultCache
+from encoding import cost_matrix, encode
+from memory import MEMORY_MODES
+from phases import PhaseTimer, count, timed
+from progress import PROGRESS_FORMATS, ProgressReporter, expect
+from recursion_trace import RecursionTracer, print_summary
 
 # Constants
 DELTA = 30
@@ -24,39 +40,34 @@ def generate_string(base_string, indices) -> str:
     return base_string
 
 
-def parse_input_file(file_path) -> tuple[str, str]:
-    with open(file_path, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-
-    string1 = lines[0]
-    idx = 1
-
-    indices1 = []
-    while lines[idx].isdigit():
-        indices1.append(int(lines[idx]))
-        idx += 1
-
-    string2 = lines[idx]
-    idx += 1
+def original_sequence_alignment(X, Y, delta, alpha) -> Alignment:
+    """
+    Perform sequence alignment using dynamic programming.
+    Traceback priority: diagonal > left > up [Bois this should be same for all]
+    """
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
 
-    indices2 = []
-    while idx < len(lines):
-        indices2.append(int(lines[idx]))
-        idx += 1
+    ops = []
+    minimum_alignment_cost = range_alignment_ops(x_codes, y_codes, 0, len(X), 0, len(Y), delta, costs, ops)
 
-    output_string1 = generate_string(string1, indices1)
-    output_string2 = generate_string(string2, indices2)
+    return Alignment(ops, x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
 
-    return output_string1, output_string2
 
-def original_sequence_alignment(X, Y, delta, alpha) -> tuple[int, str, str]:
+@timed('leaf')
+def range_alignment_ops(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs, ops) -> int:
     """
-    Perform sequence alignment using dynamic programming.
-    Traceback priority: diagonal > left > up [Bois this should be same for all]
+    Full-table alignment of x_codes[xlo:xhi] against y_codes[ylo:yhi] that
+    appends its edit operations to ops and returns the cost. Indexes the
+    shared encoded buffers instead of slicing them.
+    Traceback priority: diagonal > left > up
     """
-    m, n = len(X), len(Y)
+    m, n = xhi - xlo, yhi - ylo
+    count('cells', m * n)
+    reporter = ProgressReporter.active()
 
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    dp = [array('q', [0]) * (n + 1) for _ in range(m + 1)]
 
     # base cases
     for i in range(m + 1):
@@ -67,58 +78,60 @@ def original_sequence_alignment(X, Y, delta, alpha) -> tuple[int, str, str]:
 
     # dp table
     for i in range(1, m + 1):
+        prev, curr = dp[i - 1], dp[i]
+        row_costs = costs[x_codes[xlo + i - 1]]
+        left = curr[0]
         for j in range(1, n + 1):
-
-            dp[i][j] = min(dp[i - 1][j - 1] + alpha[X[i - 1], Y[j - 1]],
-                           dp[i - 1][j] + delta,
-                           dp[i][j - 1] + delta)
+            best = prev[j - 1] + row_costs[y_codes[ylo + j - 1]]
+            if prev[j] + delta < best:
+                best = prev[j] + delta
+            if left + delta < best:
+                best = left + delta
+            curr[j] = left = best
+        if reporter:
+            reporter.advance(n)
 
     minimum_alignment_cost = dp[m][n]
 
-    aligned_x = []
-    aligned_y = []
+    # moves are found back to front
+    moves = []
 
     i, j = m, n
     while i > 0 or j > 0:
         if i == 0:
-            aligned_x.append('_')
-            aligned_y.append(Y[j - 1])
+            moves.append(GAP_X)
             j -= 1
         elif j == 0:
-            aligned_x.append(X[i - 1])
-            aligned_y.append('_')
+            moves.append(GAP_Y)
             i -= 1
         else:
-            match_cost = dp[i - 1][j - 1] + alpha[X[i - 1], Y[j - 1]]
+            match_cost = dp[i - 1][j - 1] + costs[x_codes[xlo + i - 1]][y_codes[ylo + j - 1]]
             insert_cost = dp[i][j - 1] + delta
 
             # Diagonal
             if dp[i][j] == match_cost:
-                aligned_x.append(X[i - 1])
-                aligned_y.append(Y[j - 1])
+                moves.append(MATCH)
                 i -= 1
                 j -= 1
             # Left
             elif dp[i][j] == insert_cost:
-                aligned_x.append('_')
-                aligned_y.append(Y[j - 1])
+                moves.append(GAP_X)
                 j -= 1
             # Up
             else:
-                aligned_x.append(X[i - 1])
-                aligned_y.append('_')
+                moves.append(GAP_Y)
                 i -= 1
 
-    aligned_x.reverse()
-    aligned_y.reverse()
+    for op in reversed(moves):
+        append_op(ops, op)
 
-    return minimum_alignment_cost, ''.join(aligned_x), ''.join(aligned_y)
+    return minimum_alignment_cost
 
 
 # This funciton is to find the best scores between X and all prefixes of Y
 
 
-def sequence_alignment(X, Y, delta, alpha,flag) -> list[int]:
+def sequence_alignment(X, Y, delta, alpha,flag) -> array:
     """
     Perform sequence alignment using dynamic programming.
     Just returns the minimum alignment cost.
@@ -126,10 +139,33 @@ def sequence_alignment(X, Y, delta, alpha,flag) -> list[int]:
         0 is to find the best scores between X and all prefixes of Y
         1 is to find the best scores between X and all suffixes of Y
     """
-    m, n = len(X), len(Y)
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    return score_pass(x_codes, y_codes, 0, len(X), 0, len(Y), delta, costs, flag)
+
+
+@timed('score_pass')
+def score_pass(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs, flag) -> array:
+    """
+    Last DP row of x_codes[xlo:xhi] against y_codes[ylo:yhi] using two rolling
+    rows. flag 1 walks both ranges backwards, i.e. aligns the reversed strings.
+    """
+    m, n = xhi - xlo, yhi - ylo
+    count('cells', m * n)
+    reporter = ProgressReporter.active()
 
-    prev = [j * delta for j in range(n + 1)]
-    curr = [0] * (n + 1)
+    # X[m - i], Y[n - j] means we are aligning reversed strings
+    if flag == 0:
+        x_index, x_step = xlo - 1, 1
+        y_index, y_step = ylo - 1, 1
+    else:
+        x_index, x_step = xhi, -1
+        y_index, y_step = yhi, -1
+
+    prev = array('q', [j * delta for j in range(n + 1)])
+    curr = array('q', [0]) * (n + 1)
 
     # dp = [[0] * (n + 1) for _ in range(2)]
     #
@@ -156,50 +192,405 @@ def sequence_alignment(X, Y, delta, alpha,flag) -> list[int]:
     #
     # minimum_alignment_cost = dp[m%2]
     for i in range(1, m + 1):
-        curr[0] = i * delta
+        row_costs = costs[x_codes[x_index + i * x_step]]
+        left = curr[0] = i * delta
         for j in range(1, n + 1):
-            if flag == 0:
-                match_cost = alpha[X[i - 1], Y[j - 1]]
-            else:
-                match_cost = alpha[X[m - i], Y[n - j]]
-
-            curr[j] = min(prev[j - 1] + match_cost,
-                          prev[j] + delta,
-                          curr[j - 1] + delta)
+            best = prev[j - 1] + row_costs[y_codes[y_index + j * y_step]]
+            if prev[j] + delta < best:
+                best = prev[j] + delta
+            if left + delta < best:
+                best = left + delta
+            curr[j] = left = best
         prev, curr = curr, prev
+        if reporter:
+            reporter.advance(n)
 
     return prev
 
 
-def hirschberg(X, Y, delta, alpha) -> tuple[int, str, str]:
+@timed('score_block')
+def score_block(x_codes, y_codes, xlo, xhi, ylo, yhi, flag, r0, r1, c0, c1, top, left, delta, costs) \
+        -> tuple[array, array]:
+    """
+    Rows r0 + 1..r1 and columns c0..c1 of score_pass's table for
+    x_codes[xlo:xhi] against y_codes[ylo:yhi], from row r0 over those
+    columns (top) and column c0 over those rows (left). Returns the block's
+    last row, columns c0..c1, and last column, rows r0 + 1..r1, the inputs
+    of the blocks below it and to its right.
+    """
+    count('cells', (r1 - r0) * (c1 - c0))
+
+    if flag == 0:
+        x_index, x_step = xlo - 1, 1
+        y_index, y_step = ylo - 1, 1
+    else:
+        x_index, x_step = xhi, -1
+        y_index, y_step = yhi, -1
+
+    width = c1 - c0
+    prev = array('q', top)
+    curr = array('q', [0]) * (width + 1)
+    right = array('q', [0]) * (r1 - r0)
+    for i in range(1, r1 - r0 + 1):
+        row_costs = costs[x_codes[x_index + (r0 + i) * x_step]]
+        left_value = curr[0] = left[i - 1]
+        for j in range(1, width + 1):
+            best = prev[j - 1] + row_costs[y_codes[y_index + (c0 + j) * y_step]]
+            if prev[j] + delta < best:
+                best = prev[j] + delta
+            if left_value + delta < best:
+                best = left_value + delta
+            curr[j] = left_value = best
+        right[i - 1] = curr[width]
+        prev, curr = curr, prev
+
+    return prev, right
+
+
+def hirschberg(X, Y, delta, alpha) -> Alignment:
     """
     Hirschberg's algorithm for memory-efficient sequence alignment.
-    Returns the aligned sequences as strings.
-    """
-    
-    if len(X) <=2 or len(Y) <=2:
-        return original_sequence_alignment(X, Y, delta, alpha)
-
-    k = get_optimal_split_point(X, Y, delta, alpha)
-    m = len(X)
-    minimum_alignment_cost1, aligned_x1, aligned_y1 = hirschberg(X[:m // 2], Y[:k], delta, alpha)
-    minimum_alignment_cost2, aligned_x2, aligned_y2 = hirschberg(X[m // 2:], Y[k:], delta, alpha)
-    
-    minimum_alignment_cost = minimum_alignment_cost1 + minimum_alignment_cost2
-    aligned_x = aligned_x1 + aligned_x2
-    aligned_y = aligned_y1 + aligned_y2
-    
-    return minimum_alignment_cost, aligned_x, aligned_y
+    Returns an Alignment backed by the run-length op list; the aligned
+    strings are only built when it is unpacked or asked for them.
+    """
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    expect(expected_cells(len(X), len(Y)))
+
+    ops = []
+    minimum_alignment_cost = hirschberg_range(x_codes, y_codes, 0, len(X), 0, len(Y), delta, costs, ops)
+
+    return Alignment(ops, x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
+
+
+def hirschberg_range(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs, ops, depth=0) -> int:
+    """
+    Hirschberg recursion on x_codes[xlo:xhi] and y_codes[ylo:yhi].
+    Every level works on index bounds into the same two encoded buffers, so
+    no substrings are copied, and appends its edit operations to the one
+    shared ops list (left half first) instead of concatenating strings.
+    Returns the cost.
+    """
+    tracer = RecursionTracer.active()
+    start = tracer and time.perf_counter_ns()
+
+    if xhi - xlo <= 2 or yhi - ylo <= 2:
+        minimum_alignment_cost = range_alignment_ops(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs, ops)
+        if tracer:
+            tracer.record(depth, xlo, xhi, ylo, yhi, None, time.perf_counter_ns() - start)
+        return minimum_alignment_cost
+
+    xmid = (xlo + xhi) // 2
+    ymid = split_point(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs)
+    if tracer:
+        tracer.record(depth, xlo, xhi, ylo, yhi, ymid, time.perf_counter_ns() - start)
+
+    minimum_alignment_cost1 = hirschberg_range(x_codes, y_codes, xlo, xmid, ylo, ymid, delta, costs, ops, depth + 1)
+    minimum_alignment_cost2 = hirschberg_range(x_codes, y_codes, xmid, xhi, ymid, yhi, delta, costs, ops, depth + 1)
+
+    return minimum_alignment_cost1 + minimum_alignment_cost2
+
+def iterative_hirschberg(X, Y, delta, alpha, cell_budget=4_000_000) -> Alignment:
+    """
+    Hirschberg's algorithm driven by an explicit stack instead of recursion.
+    Any subproblem whose m * n fits in cell_budget is solved directly with a
+    full table, so most of the tree becomes cheap leaf work and memory stays
+    bounded by the budget. A budget of 0 reproduces hirschberg exactly.
+    """
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    expect(expected_cells(len(X), len(Y), cell_budget))
+
+    ops = []
+    minimum_alignment_cost = iterative_hirschberg_range(x_codes, y_codes, 0, len(X), 0, len(Y), delta, costs,
+                                                        cell_budget, ops)
+
+    return Alignment(ops, x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
+
+
+def iterative_hirschberg_range(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs, cell_budget, ops) -> int:
+    """
+    Explicit-stack Hirschberg on x_codes[xlo:xhi] and y_codes[ylo:yhi],
+    appending edit operations to ops. Returns the cost.
+    """
+    minimum_alignment_cost = 0
+    tracer = RecursionTracer.active()
+
+    # subproblems are popped left to right, so leaf results arrive in order
+    stack = [(xlo, xhi, ylo, yhi, 0)]
+    while stack:
+        xlo, xhi, ylo, yhi, depth = stack.pop()
+        start = tracer and time.perf_counter_ns()
+
+        if is_leaf(xlo, xhi, ylo, yhi, cell_budget):
+            minimum_alignment_cost += range_alignment_ops(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs, ops)
+            if tracer:
+                tracer.record(depth, xlo, xhi, ylo, yhi, None, time.perf_counter_ns() - start)
+            continue
+
+        xmid = (xlo + xhi) // 2
+        ymid = split_point(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs)
+        if tracer:
+            tracer.record(depth, xlo, xhi, ylo, yhi, ymid, time.perf_counter_ns() - start)
+        stack.append((xmid, xhi, ymid, yhi, depth + 1))
+        stack.append((xlo, xmid, ylo, ymid, depth + 1))
+
+    return minimum_alignment_cost
+
+
+def is_leaf(xlo, xhi, ylo, yhi, cell_budget) -> bool:
+    """Whether a subproblem is solved with a full table rather than split."""
+    m, n = xhi - xlo, yhi - ylo
+    return m <= 2 or n <= 2 or m * n <= cell_budget
+
+
+def expected_cells(m, n, cell_budget=0) -> int:
+    """
+    Cells a Hirschberg run evaluates if every split is even: the split
+    passes of each level cover half the cells of the level above, down to
+    the level whose subproblems are leaves.
+    """
+    total = 0
+    parts = 1
+    while True:
+        total += m * n // parts
+        if is_leaf(0, m // parts, 0, n // parts, cell_budget):
+            return total
+        parts *= 2
+
+
+# Per-process view of the shared sequences, filled in by init_worker
+worker_state = {}
+
+
+def attach_shared_memory(name) -> shared_memory.SharedMemory:
+    """Attach to a block created by the parent without adopting its cleanup."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no track flag; the pool shares the parent's
+        # resource tracker, so registering the name again is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+def init_worker(x_name, y_name, m, n, delta, costs):
+    """Pool initializer: map the shared sequences once per worker process."""
+    # a forked worker inherits the parent's active instances; only the parent reports
+    for context in (PhaseTimer, RecursionTracer, ProgressReporter):
+        context.deactivate()
+
+    x_shm = attach_shared_memory(x_name)
+    y_shm = attach_shared_memory(y_name)
+    worker_state.update(x_shm=x_shm, y_shm=y_shm, x_codes=x_shm.buf[:m], y_codes=y_shm.buf[:n],
+                        delta=delta, costs=costs)
+
+
+def worker_score_block(xlo, xhi, ylo, yhi, flag, r0, r1, c0, c1, top, left) -> tuple[array, array]:
+    """One block of a split score pass, run inside a pool worker."""
+    state = worker_state
+    return score_block(state['x_codes'], state['y_codes'], xlo, xhi, ylo, yhi, flag, r0, r1, c0, c1, top, left,
+                       state['delta'], state['costs'])
+
+
+def worker_solve(xlo, xhi, ylo, yhi, cell_budget) -> tuple[int, list]:
+    """Align a whole subproblem inside a pool worker; returns cost and ops."""
+    state = worker_state
+    ops = []
+    cost = iterative_hirschberg_range(state['x_codes'], state['y_codes'], xlo, xhi, ylo, yhi,
+                                      state['delta'], state['costs'], cell_budget, ops)
+    return cost, ops
+
+
+def cuts(length, parts) -> list[int]:
+    """parts + 1 even cut positions from 0 to length."""
+    return [length * part // parts for part in range(parts + 1)]
+
+
+class BlockedScorePass:
+    """
+    A score pass cut into a grid of row chunks by column stripes whose
+    blocks run on a pool as their inputs become ready: block (r, c) needs
+    the last row of (r - 1, c) and the last column of (r, c - 1), so the
+    blocks of one anti-diagonal run at the same time and the stripes form a
+    pipeline.
+    """
+
+    def __init__(self, xlo, xhi, ylo, yhi, flag, delta, workers, block=256):
+        self.bounds = (xlo, xhi, ylo, yhi, flag)
+        m, n = xhi - xlo, yhi - ylo
+        columns = max(1, min(workers, n // block))
+        # one stripe is a plain serial pass; more need a few chunks each to fill the pipeline
+        rows = 1 if columns == 1 else max(1, min(4 * columns, m // block))
+        self.row_cuts = cuts(m, rows)
+        self.column_cuts = cuts(n, columns)
+
+        # tops[c]: last finished row over stripe c, lefts[r]: last finished column over chunk r
+        self.tops = [array('q', [j * delta for j in range(c0, c1 + 1)])
+                     for c0, c1 in zip(self.column_cuts, self.column_cuts[1:])]
+        self.lefts = [array('q', [i * delta for i in range(r0 + 1, r1 + 1)])
+                      for r0, r1 in zip(self.row_cuts, self.row_cuts[1:])]
+        # chunks finished per stripe
+        self.done = [0] * columns
+
+    def submit(self, pool, r, c):
+        r0, r1 = self.row_cuts[r], self.row_cuts[r + 1]
+        c0, c1 = self.column_cuts[c], self.column_cuts[c + 1]
+        return pool.submit(worker_score_block, *self.bounds, r0, r1, c0, c1, self.tops[c], self.lefts[r])
+
+    def cells(self, r, c) -> int:
+        return ((self.row_cuts[r + 1] - self.row_cuts[r])
+                * (self.column_cuts[c + 1] - self.column_cuts[c]))
+
+    def finish(self, r, c, bottom, right) -> list[tuple[int, int]]:
+        """Store a finished block's outputs; returns the blocks that became ready."""
+        self.tops[c], self.lefts[r] = bottom, right
+        self.done[c] = r + 1
+        rows, columns = len(self.lefts), len(self.tops)
+
+        ready = []
+        if r + 1 < rows and (c == 0 or self.done[c - 1] > r + 1):
+            ready.append((r + 1, c))
+        if c + 1 < columns and self.done[c + 1] == r:
+            ready.append((r, c + 1))
+        return ready
+
+    def last_row(self) -> array:
+        """The pass's result once every block finished, as score_pass returns it."""
+        row = array('q', self.tops[0])
+        for top in self.tops[1:]:
+            row.extend(top[1:])
+        return row
+
+
+def run_score_passes(pool, passes, reporter=None):
+    """Run the blocks of every BlockedScorePass on pool until all are finished."""
+    pending = {}
+    for score_pass in passes:
+        pending[score_pass.submit(pool, 0, 0)] = (score_pass, 0, 0)
+
+    while pending:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            score_pass, r, c = pending.pop(future)
+            for block in score_pass.finish(r, c, *future.result()):
+                pending[score_pass.submit(pool, *block)] = (score_pass, *block)
+            if reporter:
+                reporter.advance(score_pass.cells(r, c))
+
+
+def parallel_hirschberg(X, Y, delta, alpha, workers=None, cell_budget=4_000_000, pass_block=256) -> Alignment:
+    """
+    Hirschberg's algorithm spread over a process pool.
+    The encoded sequences live in multiprocessing.shared_memory, so tasks only
+    carry index bounds and block boundaries. The top of the recursion tree
+    is expanded level by level, with the forward and backward half-passes of
+    every split cut into blocks of at least pass_block cells a side that run
+    as a pipeline over the workers (see BlockedScorePass), so the root split
+    is parallel too. Once there are enough independent subproblems to keep
+    all workers busy, those are solved in the pool with
+    iterative_hirschberg_range. Gives the same alignment as
+    iterative_hirschberg with the same cell_budget. Every block is one pool
+    task, so passes narrower than two blocks stay serial, and the speedup
+    depends on the input and pool overhead: benchmark.py --engines
+    efficient:parallel --workers N measures it.
+    """
+    workers = workers or os.cpu_count() or 1
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+    m, n = len(x_codes), len(y_codes)
+
+    # workers cannot see the reporter, so progress advances as their tasks return
+    expect(expected_cells(m, n, cell_budget))
+    reporter = ProgressReporter.active()
+
+    x_shm = shared_memory.SharedMemory(create=True, size=max(1, m))
+    y_shm = shared_memory.SharedMemory(create=True, size=max(1, n))
+    try:
+        x_shm.buf[:m] = x_codes
+        y_shm.buf[:n] = y_codes
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(x_shm.name, y_shm.name, m, n, delta, costs)) as pool:
+            frontier = [(0, m, 0, n)]
+            while len(frontier) < 2 * workers:
+                splits = {}
+                for node in frontier:
+                    xlo, xhi, ylo, yhi = node
+                    if not is_leaf(xlo, xhi, ylo, yhi, cell_budget):
+                        xmid = (xlo + xhi) // 2
+                        splits[node] = (BlockedScorePass(xlo, xmid, ylo, yhi, 0, delta, workers, pass_block),
+                                        BlockedScorePass(xmid, xhi, ylo, yhi, 1, delta, workers, pass_block))
+                if not splits:
+                    break
+                run_score_passes(pool, [half for halves in splits.values() for half in halves], reporter)
+
+                next_frontier = []
+                for node in frontier:
+                    if node not in splits:
+                        next_frontier.append(node)
+                        continue
+                    xlo, xhi, ylo, yhi = node
+                    forward, backward = splits[node]
+                    xmid = (xlo + xhi) // 2
+                    ymid = ylo + best_split(forward.last_row(), backward.last_row())
+                    next_frontier.append((xlo, xmid, ylo, ymid))
+                    next_frontier.append((xmid, xhi, ymid, yhi))
+                frontier = next_frontier
+
+            results = []
+            for (xlo, xhi, ylo, yhi), result in zip(frontier, pool.map(worker_solve, *zip(*frontier),
+                                                                        [cell_budget] * len(frontier))):
+                results.append(result)
+                if reporter:
+                    reporter.advance(expected_cells(xhi - xlo, yhi - ylo, cell_budget))
+    finally:
+        x_shm.close()
+        y_shm.close()
+        x_shm.unlink()
+        y_shm.unlink()
+
+    minimum_alignment_cost = 0
+    ops = []
+    for cost, leaf_ops in results:
+        minimum_alignment_cost += cost
+        extend_ops(ops, leaf_ops)
+
+    return Alignment(ops, x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
 
 def get_optimal_split_point(X, Y, delta, alpha)-> int:
     """
     Helper function to find the optimal split point in Hirschberg's algorithm.
     """
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    return split_point(x_codes, y_codes, 0, len(X), 0, len(Y), delta, costs)
+
+def split_point(x_codes, y_codes, xlo, xhi, ylo, yhi, delta, costs) -> int:
+    """
+    Column in ylo..yhi where the optimal path crosses the middle row of
+    x_codes[xlo:xhi].
+    """
+    xmid = (xlo + xhi) // 2
+    v1=score_pass(x_codes, y_codes, xlo, xmid, ylo, yhi, delta, costs, 0)
+    v2=score_pass(x_codes, y_codes, xmid, xhi, ylo, yhi, delta, costs, 1)
+
+    return ylo + best_split(v1, v2)
+
+def best_split(v1, v2) -> int:
+    """
+    Offset k minimising the forward score of the prefix Y[:k] plus the
+    backward score of the suffix Y[k:]; the first minimum wins.
+    """
     bestk=0
     best=math.inf
-    m , n = len(X), len(Y)
-    v1=sequence_alignment(X[:m//2], Y, delta, alpha, 0)
-    v2=sequence_alignment(X[m//2:], Y, delta, alpha, 1)
+    n = len(v1) - 1
     for j in range(n+1):
         if v1[j]+v2[n-j]<best:
             best=v1[j]+v2[n-j]
@@ -242,33 +633,96 @@ def format_output(output_path, cost, aligned1, aligned2, time_ms, memory_kb):
         f.write(f"{memory_kb}\n")
 
 
-def main():
-    if len(sys.argv) != 3:
-        print("Expected python3/py efficient.py <input_file> <output_file>")
-        sys.exit(1)
+# Alignment engines selectable with --engine, all share the
+# (X, Y, delta, alpha) -> Alignment signature
+ENGINES = {
+    'hirschberg': hirschberg,
+    'iterative': iterative_hirschberg,
+}
 
-    input_path = sys.argv[1]
-    output_path = sys.argv[2]
 
-    string1, string2 = parse_input_file(input_path)
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Memory-efficient sequence alignment")
+    parser.add_argument("input_file")
+    parser.add_argument("output_file")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default='hirschberg',
+                        help="divide-and-conquer engine (default: hirschberg)")
+    parser.add_argument("--cell-budget", type=int, default=4_000_000,
+                        help="largest m * n solved with a full table by --engine iterative "
+                             "(default: 4000000)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="run --engine iterative on N processes with shared-memory sequences "
+                             "(default: 1)")
+    parser.add_argument("--format", choices=['text', 'cigar'], default='text',
+                        help="write the two gapped strings (text) or one run-length CIGAR line "
+                             "(default: text)")
+    parser.add_argument("--memory", choices=MEMORY_MODES, default='peak',
+                        help="memory line of the output: peak RSS added by the alignment (peak), "
+                             "tracemalloc peak, slower (traced), or RSS after the run (rss) "
+                             "(default: peak)")
+    parser.add_argument("--profile", default=None, metavar="PATH",
+                        help="write per-phase timings and cell counts as JSON (default: off)")
+    parser.add_argument("--cache", default=None, metavar="PATH",
+                        help="SQLite file caching results by input, scoring and engine (default: off)")
+    parser.add_argument("--progress", choices=sorted(PROGRESS_FORMATS), default=None,
+                        help="report cells done and ETA on stderr as a status line (text) or JSON lines "
+                             "(json) (default: off)")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="write every Hirschberg recursion node as a JSON line and print work per "
+                             "depth to stderr; not traced with --workers (default: off)")
+    args = parser.parse_args(argv)
+    if args.workers > 1 and args.engine != 'iterative':
+        parser.error("--workers parallelises the iterative engine only; add --engine iterative")
+    return args
+
+
+def engine_name(args) -> str:
+    """
+    Name of the aligner make_aligner builds, with the options that change
+    its alignment; the cache key and the metrics sidecar's engine.
+    """
+    if args.workers > 1:
+        return f"efficient:parallel:{args.cell_budget}"
+    if args.engine == 'iterative':
+        return f"efficient:iterative:{args.cell_budget}"
+    return f"efficient:{args.engine}"
 
-    # Start
-    start_time = time.time()
 
-    # main function
-    min_cost, aligned1, aligned2 = hirschberg(string1, string2, DELTA, ALPHA)
+def make_aligner(args, cache=None):
+    """
+    The (X, Y, delta, alpha) alignment function selected by parsed CLI args.
+    With --cache it goes through cache, an open ResultCache of that file, or
+    a new one if cache is None.
+    """
+    align = ENGINES[args.engine]
+    if args.engine == 'iterative':
+        align = functools.partial(align, cell_budget=args.cell_budget)
+    if args.workers > 1:
+        align = functools.partial(parallel_hirschberg, workers=args.workers, cell_budget=args.cell_budget)
+    if args.cache:
+        align = (cache or ResultCache(args.cache)).cached(align, engine_name(args))
+    return align
+
 
-    cost = calculate_alignment_cost(aligned1, aligned2, DELTA, ALPHA)
-    # End
-    end_time = time.time()
-    time_ms = (end_time - start_time) * 1000
+def run(input_path, output_path, align, output_format='text', memory_mode='peak', profile_path=None,
+        engine=None):
+    """basic.run with this module's DELTA and ALPHA."""
+    basic.run(input_path, output_path, align, output_format, memory_mode, profile_path, engine,
+              delta=DELTA, alpha=ALPHA)
 
-    # memory usage
-    memory = process_memory()
 
-    format_output(output_path, cost, aligned1, aligned2, time_ms, memory)
-    pass
+def main():
+    args = parse_args(sys.argv[1:])
+    with ExitStack() as stack:
+        tracer = stack.enter_context(RecursionTracer(args.trace)) if args.trace else None
+        if args.progress:
+            stack.enter_context(ProgressReporter(PROGRESS_FORMATS[args.progress]))
+        run(args.input_file, args.output_file, make_aligner(args), args.format, args.memory, args.profile,
+            engine_name(args))
+
+    if tracer:
+        print_summary(tracer.summary(), file=sys.stderr)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
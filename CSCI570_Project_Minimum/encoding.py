@@ -0,0 +1,41 @@
+"""
+Shared integer representation used by every alignment engine.
+
+Sequences are encoded once into small-integer codes (one byte per
+character) and scoring goes through a dense cost matrix indexed by those
+codes, instead of hashing a (char, char) tuple into ALPHA for every cell.
+"""
+from phases import timed
+
+
+def cost_matrix(alpha) -> tuple[str, list[list[int]]]:
+    """
+    Build the alphabet and the N x N cost matrix for a (char, char) keyed
+    ALPHA dict. Character codes follow the order of the returned alphabet.
+    """
+    alphabet = ''.join(sorted({a for a, _ in alpha} | {b for _, b in alpha}))
+    code = {c: k for k, c in enumerate(alphabet)}
+
+    costs = [[0] * len(alphabet) for _ in alphabet]
+    for (a, b), value in alpha.items():
+        costs[code[a]][code[b]] = value
+
+    return alphabet, costs
+
+
+@timed('encode')
+def encode(seq, alphabet) -> bytes:
+    """Encode a sequence into one code per character, in alphabet order."""
+    table = bytes.maketrans(alphabet.encode('ascii'), bytes(range(len(alphabet))))
+    codes = seq.encode('ascii').translate(table)
+
+    if codes and max(codes) >= len(alphabet):
+        raise ValueError(f"Sequence contains characters outside the alphabet {alphabet!r}")
+
+    return codes
+
+
+def decode(codes, alphabet) -> str:
+    """Turn a buffer of codes back into the characters they stand for."""
+    table = bytes.maketrans(bytes(range(len(alphabet))), alphabet.encode('ascii'))
+    return bytes(codes).translate(table).decode('ascii')
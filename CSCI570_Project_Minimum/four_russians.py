@@ -0,0 +1,170 @@
+from bisect import bisect_left
+from functools import lru_cache
+
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, ops_from_moves
+from encoding import cost_matrix, encode
+from phases import count, phase
+from progress import ProgressReporter, expect
+
+
+def block_values(x_part, y_part, corner, top, left, delta, costs) -> list[list[int]]:
+    """
+    Fill one block of the DP table from its boundary.
+    corner is the value of the top-left cell, top and left hold the
+    differences between consecutive cells of the block's top row and left
+    column. Returns every row of the block, boundary included.
+    """
+    prev = [corner]
+    for d in top:
+        prev.append(prev[-1] + d)
+    rows = [prev]
+
+    for r in range(len(x_part)):
+        row_costs = costs[x_part[r]]
+        curr = [prev[0] + left[r]]
+        left_value = curr[0]
+        for c in range(len(y_part)):
+            best = prev[c] + row_costs[y_part[c]]
+            if prev[c + 1] + delta < best:
+                best = prev[c + 1] + delta
+            if left_value + delta < best:
+                best = left_value + delta
+            curr.append(best)
+            left_value = best
+        rows.append(curr)
+        prev = curr
+
+    return rows
+
+
+def row_corners(start, tops) -> list[int]:
+    """
+    Top-left values of the blocks along one block row, from the value start
+    at column 0 and the row's top boundary differences, plus the value at
+    its right end.
+    """
+    corners = [start]
+    for top in tops:
+        corners.append(corners[-1] + sum(top))
+    return corners
+
+
+def block_alignment(X, Y, delta, alpha, x_cuts, y_cuts, cache_size=131072, stats=None) -> Alignment:
+    """
+    Tile the DP table with the blocks given by x_cuts and y_cuts (sorted cut
+    positions from 0 to len). A block's outputs only depend on its two
+    substrings and the difference-encoded top and left boundaries, so
+    transitions are memoized in a bounded LRU cache and reused whenever the
+    same block input shows up again.
+    Block boundaries are kept for the traceback, which recomputes one block at
+    a time and follows the same diagonal > left > up order as
+    basic.sequence_alignment.
+    If stats is a dict it receives the number of blocks, cache hits and
+    misses, and DP cells actually computed; the same cells go to the
+    profile's 'cells' counter. Progress counts the table cells covered, one
+    row of blocks at a time, whether computed or memoized.
+    """
+    m, n = len(X), len(Y)
+
+    alphabet, costs = cost_matrix(alpha)
+    x_codes = encode(X, alphabet)
+    y_codes = encode(Y, alphabet)
+
+    x_parts = [x_codes[x_cuts[b]:x_cuts[b + 1]] for b in range(len(x_cuts) - 1)]
+    y_parts = [y_codes[y_cuts[b]:y_cuts[b + 1]] for b in range(len(y_cuts) - 1)]
+    cells = 0
+
+    @lru_cache(maxsize=cache_size)
+    def transition(x_part, y_part, top, left):
+        nonlocal cells
+        cells += len(x_part) * len(y_part)
+        count('cells', len(x_part) * len(y_part))
+        rows = block_values(x_part, y_part, 0, top, left, delta, costs)
+        bottom = tuple(rows[-1][c + 1] - rows[-1][c] for c in range(len(y_part)))
+        right = tuple(rows[r + 1][-1] - rows[r][-1] for r in range(len(x_part)))
+        return bottom, right
+
+    expect(m * n)
+    reporter = ProgressReporter.active()
+
+    with phase('fill'):
+        # tops[bi][bj] / lefts[bi][bj]: boundary differences entering block (bi, bj),
+        # corners[bi][bj]: value of its top-left cell
+        tops = [[(delta,) * len(part) for part in y_parts]]
+        lefts = []
+        corners = []
+        for bi, x_part in enumerate(x_parts):
+            corners.append(row_corners(x_cuts[bi] * delta, tops[-1]))
+            left = (delta,) * len(x_part)
+            bottoms = []
+            row_lefts = []
+            for bj, y_part in enumerate(y_parts):
+                row_lefts.append(left)
+                bottom, left = transition(x_part, y_part, tops[-1][bj], left)
+                bottoms.append(bottom)
+            tops.append(bottoms)
+            lefts.append(row_lefts)
+            if reporter:
+                reporter.advance(len(x_part) * n)
+        corners.append(row_corners(x_cuts[-1] * delta, tops[-1]))
+
+    minimum_alignment_cost = corners[-1][-1]
+
+    # moves are found back to front
+    moves = []
+
+    with phase('traceback'):
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i == 0:
+                moves.append(GAP_X)
+                j -= 1
+                continue
+            if j == 0:
+                moves.append(GAP_Y)
+                i -= 1
+                continue
+
+            # recompute the block whose interior holds (i, j)
+            bi = bisect_left(x_cuts, i) - 1
+            bj = bisect_left(y_cuts, j) - 1
+            i0, j0 = x_cuts[bi], y_cuts[bj]
+            rows = block_values(x_parts[bi], y_parts[bj], corners[bi][bj], tops[bi][bj], lefts[bi][bj],
+                                delta, costs)
+            cells += len(x_parts[bi]) * len(y_parts[bj])
+            count('cells', len(x_parts[bi]) * len(y_parts[bj]))
+
+            while i > i0 and j > j0:
+                current = rows[i - i0][j - j0]
+
+                # Diagonal
+                if current == rows[i - i0 - 1][j - j0 - 1] + costs[x_codes[i - 1]][y_codes[j - 1]]:
+                    moves.append(MATCH)
+                    i -= 1
+                    j -= 1
+                # Left
+                elif current == rows[i - i0][j - j0 - 1] + delta:
+                    moves.append(GAP_X)
+                    j -= 1
+                # Up
+                else:
+                    moves.append(GAP_Y)
+                    i -= 1
+
+    if stats is not None:
+        info = transition.cache_info()
+        stats.update(blocks=len(x_parts) * len(y_parts), hits=info.hits,
+                     misses=info.misses, cells=cells)
+
+    return Alignment(ops_from_moves(moves), x_codes, y_codes, alphabet, delta, costs, minimum_alignment_cost)
+
+
+def four_russians_alignment(X, Y, delta, alpha, block=4, cache_size=131072, stats=None) -> Alignment:
+    """
+    Four-Russians style alignment: tile the table with block x block squares
+    and memoize block transitions (see block_alignment).
+    Same cost and traceback as basic.sequence_alignment.
+    """
+    x_cuts = list(range(0, len(X), block)) + [len(X)]
+    y_cuts = list(range(0, len(Y), block)) + [len(Y)]
+    return block_alignment(X, Y, delta, alpha, x_cuts, y_cuts, cache_size, stats)
@@ -0,0 +1,103 @@
+"""
+Memory measurement for one phase of a run.
+
+process_memory() in basic.py / efficient.py reads the current RSS once,
+after the alignment, so it misses the peak reached during the DP fill or
+deep in the Hirschberg recursion and includes the interpreter's baseline.
+MemoryMonitor instead records, for the block it wraps:
+    baseline_kb     RSS when the block starts
+    peak_rss_kb     highest RSS seen inside the block, from a sampling
+                    thread and the kernel's high-water mark (getrusage)
+    peak_delta_kb   peak_rss_kb - baseline_kb, the memory the block added
+    traced_peak_kb  peak of Python allocations (tracemalloc), if traced
+"""
+import resource
+import sys
+import threading
+import tracemalloc
+
+import psutil
+
+# seconds between RSS samples
+SAMPLE_INTERVAL = 0.005
+
+# ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+MAXRSS_SCALE = 1024 if sys.platform == 'darwin' else 1
+
+# what the memory line of an output file reports, see MemoryMonitor.value
+MEMORY_MODES = ('peak', 'traced', 'rss')
+
+
+def max_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // MAXRSS_SCALE
+
+
+class MemoryMonitor:
+    """Context manager measuring the memory used by the block it wraps."""
+
+    def __init__(self, trace=False, interval=SAMPLE_INTERVAL):
+        self.trace = trace
+        self.interval = interval
+        self.process = psutil.Process()
+        self.baseline_kb = 0
+        self.peak_rss_kb = 0
+        self.traced_peak_kb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def rss_kb(self) -> int:
+        return self.process.memory_info().rss // 1024
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss_kb = max(self.peak_rss_kb, self.rss_kb())
+
+    def __enter__(self):
+        if self.trace:
+            tracemalloc.start()
+        self._maxrss_start = max_rss_kb()
+        self.baseline_kb = self.peak_rss_kb = self.rss_kb()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.final_rss_kb = self.rss_kb()
+        self.peak_rss_kb = max(self.peak_rss_kb, self.final_rss_kb)
+
+        # a high-water mark that rose inside the block is the exact peak
+        maxrss_end = max_rss_kb()
+        if maxrss_end > self._maxrss_start:
+            self.peak_rss_kb = max(self.peak_rss_kb, maxrss_end)
+
+        if self.trace:
+            self.traced_peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        return False
+
+    @property
+    def peak_delta_kb(self) -> int:
+        return self.peak_rss_kb - self.baseline_kb
+
+    def value(self, mode='peak'):
+        """
+        The number written to an output file's memory line:
+        'peak' the block's peak RSS above its baseline, 'traced' the
+        tracemalloc peak (needs trace=True), 'rss' the RSS when the block
+        ended, as process_memory() used to report.
+        """
+        if mode == 'peak':
+            return self.peak_delta_kb
+        if mode == 'traced':
+            return int(self.traced_peak_kb)
+        return self.final_rss_kb
+
+    def report(self) -> dict:
+        return {
+            'baseline_kb': self.baseline_kb,
+            'peak_rss_kb': self.peak_rss_kb,
+            'peak_delta_kb': self.peak_delta_kb,
+            'traced_peak_kb': self.traced_peak_kb,
+        }
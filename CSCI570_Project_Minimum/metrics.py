@@ -0,0 +1,74 @@
+"""
+Metrics sidecar of one run.
+
+Every run of basic.py / efficient.py writes outputinN.metrics.json next to
+outputinN.txt with the numbers reports need (lengths, cost, timings,
+memory, engine), so plot.py never reads the aligned strings back. Output
+files from before the sidecars are stream-scanned by scan_output_file,
+which keeps only counters however long the aligned rows are.
+"""
+import json
+import os.path
+
+SUFFIX = ".metrics.json"
+
+# bytes of an aligned row read at a time when scanning a legacy output file
+SCAN_CHUNK = 1 << 16
+
+
+def metrics_path(output_path) -> str:
+    return os.path.splitext(output_path)[0] + SUFFIX
+
+
+def write_metrics(output_path, **metrics) -> str:
+    """Write the metrics of the run that wrote output_path; returns the sidecar path."""
+    path = metrics_path(output_path)
+    with open(path, "w") as f:
+        json.dump(metrics, f, indent=2)
+    return path
+
+
+def read_metrics(output_path):
+    """The sidecar of output_path, or None if the run did not write one."""
+    try:
+        with open(metrics_path(output_path)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def scan_row(f) -> tuple[int, int]:
+    """Length and gap count of the next line of a binary file, SCAN_CHUNK bytes at a time."""
+    length = gaps = 0
+    while True:
+        chunk = f.readline(SCAN_CHUNK)
+        row = chunk.rstrip(b"\r\n")
+        length += len(row)
+        gaps += row.count(b"_")
+        if not chunk or chunk.endswith(b"\n"):
+            return length, gaps
+
+
+def scan_output_file(output_path):
+    """
+    Metrics of a five-line output file (cost, both aligned rows, time,
+    memory) in constant memory, or None if it is not one.
+    """
+    with open(output_path, "rb") as f:
+        cost = f.readline().strip()
+        length1, gaps1 = scan_row(f)
+        length2, gaps2 = scan_row(f)
+        time_ms = f.readline().strip()
+        memory_kb = f.readline().strip()
+
+    if not memory_kb:
+        return None
+
+    return {
+        'm': length1 - gaps1,
+        'n': length2 - gaps2,
+        'aligned_length': length1,
+        'cost': int(float(cost)),
+        'time_ms': float(time_ms),
+        'memory_kb': float(memory_kb),
+    }
@@ -0,0 +1,102 @@
+import numpy as np
+
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, ops_from_moves
+from encoding import cost_matrix, encode
+from phases import count, phase
+from progress import ProgressReporter, expect
+
+# 2-bit move codes stored in the direction matrix
+DIAG, LEFT, UP = 0, 1, 2
+
+
+def packed_alignment(X, Y, delta, alpha) -> Alignment:
+    """
+    Sequence alignment that keeps only two rolling score rows and records the
+    winning move of every cell in a direction matrix packed four cells per
+    byte. Traceback follows the stored moves, so the full integer table is
+    never built. Same cost and diagonal > left > up traceback as
+    basic.sequence_alignment.
+    """
+    m, n = len(X), len(Y)
+
+    alphabet, costs = cost_matrix(alpha)
+    x_bytes = encode(X, alphabet)
+    y_bytes = encode(Y, alphabet)
+
+    if m == 0 or n == 0:
+        ops = [[GAP_Y, m]] if m else [[GAP_X, n]] if n else []
+        return Alignment(ops, x_bytes, y_bytes, alphabet, delta, costs, (m + n) * delta)
+
+    cost = np.array(costs, dtype=np.int64)
+    x_codes = np.frombuffer(x_bytes, dtype=np.uint8)
+    y_codes = np.frombuffer(y_bytes, dtype=np.uint8)
+
+    # one row of pair costs per letter of the alphabet
+    row_costs = cost[:, y_codes]
+
+    padded = (n + 3) // 4 * 4
+    directions = np.zeros((m, padded // 4), dtype=np.uint8)
+    moves = np.full(padded, UP, dtype=np.uint8)
+
+    ramp = np.arange(n + 1, dtype=np.int64) * delta
+    prev = ramp.copy()
+    curr = np.empty(n + 1, dtype=np.int64)
+    diag = np.empty(n, dtype=np.int64)
+
+    with phase('fill'):
+        expect(m * n)
+        reporter = ProgressReporter.active()
+        for i in range(1, m + 1):
+            np.add(prev[:-1], row_costs[x_codes[i - 1]], out=diag)
+
+            # best of diagonal and up, before considering moves from the left
+            curr[0] = i * delta
+            np.minimum(diag, prev[1:] + delta, out=curr[1:])
+
+            # curr[j] = min(curr[j], curr[j - 1] + delta) is a running minimum
+            # once the j * delta ramp is taken out
+            curr -= ramp
+            np.minimum.accumulate(curr, out=curr)
+            curr += ramp
+
+            cells = curr[1:]
+            moves[:n] = np.where(cells == diag, DIAG,
+                                 np.where(cells == curr[:-1] + delta, LEFT, UP))
+            directions[i - 1] = (moves[0::4] | (moves[1::4] << 2)
+                                 | (moves[2::4] << 4) | (moves[3::4] << 6))
+
+            prev, curr = curr, prev
+            if reporter:
+                reporter.advance(n)
+        count('cells', m * n)
+
+    minimum_alignment_cost = int(prev[n])
+
+    # moves are found back to front
+    moves = []
+
+    with phase('traceback'):
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i == 0:
+                move = LEFT
+            elif j == 0:
+                move = UP
+            else:
+                move = (directions.item(i - 1, (j - 1) >> 2) >> (((j - 1) & 3) << 1)) & 3
+
+            # Diagonal
+            if move == DIAG:
+                moves.append(MATCH)
+                i -= 1
+                j -= 1
+            # Left
+            elif move == LEFT:
+                moves.append(GAP_X)
+                j -= 1
+            # Up
+            else:
+                moves.append(GAP_Y)
+                i -= 1
+
+    return Alignment(ops_from_moves(moves), x_bytes, y_bytes, alphabet, delta, costs, minimum_alignment_cost)
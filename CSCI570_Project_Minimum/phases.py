@@ -0,0 +1,85 @@
+"""
+Per-phase timing profile of one run.
+
+A PhaseTimer is made active with a with-block (see active.py). While it is
+active, every phase(name) block adds its perf_counter_ns duration under a name nested
+in the enclosing phases (e.g. 'align/fill'), and count(name, n) adds to a
+counter such as 'cells'. With no active timer phase(), timed() and count()
+are no-ops, so engines can mark their phases unconditionally at the cost
+of one call per phase.
+"""
+import functools
+import json
+import os.path
+import time
+from contextlib import contextmanager
+
+from active import ActiveContext
+
+
+@contextmanager
+def phase(name):
+    """Time the block as name, nested in the enclosing phase."""
+    timer = PhaseTimer.active()
+    if timer is None:
+        yield
+        return
+
+    timer.stack.append(name)
+    key = '/'.join(timer.stack)
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timer.phases[key] = timer.phases.get(key, 0) + time.perf_counter_ns() - start
+        timer.calls[key] = timer.calls.get(key, 0) + 1
+        timer.stack.pop()
+
+
+def timed(name):
+    """Decorator timing every call of a function as phase name."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if PhaseTimer.active() is None:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name, n=1):
+    """Add n to a counter of the active timer."""
+    timer = PhaseTimer.active()
+    if timer is not None:
+        timer.counters[name] = timer.counters.get(name, 0) + n
+
+
+class PhaseTimer(ActiveContext):
+    """Accumulated phase durations (ns), call counts and counters of one run."""
+
+    def __init__(self):
+        self.phases = {}
+        self.calls = {}
+        self.counters = {}
+        self.stack = []
+
+    def to_dict(self) -> dict:
+        return {
+            'phases_ns': dict(self.phases),
+            'phases_ms': {name: ns / 1e6 for name, ns in self.phases.items()},
+            'calls': dict(self.calls),
+            'counters': dict(self.counters),
+        }
+
+    def write(self, path, **extra):
+        """Write the profile plus any extra fields as a JSON sidecar."""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, "w") as f:
+            json.dump({**extra, **self.to_dict()}, f, indent=2)
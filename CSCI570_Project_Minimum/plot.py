@@ -1,8 +1,12 @@
+import argparse
 from pathlib import Path
 import re
+import sys
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from metrics import read_metrics, scan_output_file
+
 basic_path = Path("CSCI570_Project_Minimum_Jul_14/Output")
 efficient_path = Path("CSCI570_Project_Minimum_Jul_14/EfficientOutput")
 
@@ -14,42 +18,165 @@ def extract_file_number(filename):
 
 
 def read_output_files(file_paths):
-    """Read output files and return sorted data"""
+    """
+    Read the metrics of output files and return sorted data. Each run's
+    metrics sidecar is used when it exists; older five-line files are
+    stream-scanned, so the aligned rows are never held in memory.
+    """
     data = []
 
     for file_path in file_paths:
-        with open(file_path, 'r') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-
-            if len(lines) >= 5:
-                cost = float(lines[0])
-                str1 = lines[1]
-                str2 = lines[2]
-                time_ms = float(lines[3])
-                memory_kb = float(lines[4])
-
-                # Calculate problem size
-                size = len(str1) + len(str2)
-
-                data.append({
-                    'file': file_path.name,
-                    'file_num': extract_file_number(file_path.name),
-                    'cost': cost,
-                    'str1': str1,
-                    'str2': str2,
-                    'len1': len(str1),
-                    'len2': len(str2),
-                    'size': size,
-                    'time_ms': time_ms,
-                    'memory_kb': memory_kb
-                })
+        metrics = read_metrics(file_path) or scan_output_file(file_path)
+        if metrics is None:
+            continue
+
+        data.append({
+            'file': file_path.name,
+            'file_num': extract_file_number(file_path.name),
+            'engine': metrics.get('engine'),
+            'cost': metrics['cost'],
+            'len1': metrics['aligned_length'],
+            'len2': metrics['aligned_length'],
+            'm': metrics['m'],
+            'n': metrics['n'],
+            # Calculate problem size
+            'size': 2 * metrics['aligned_length'],
+            'time_ms': metrics['time_ms'],
+            'memory_kb': metrics['memory_kb']
+        })
 
     # Sort by problem size
     data.sort(key=lambda x: x['size'])
     return data
 
 
+# features the complexity models are linear in
+MODELS = {
+    'm*n': lambda m, n: m * n,
+    'm+n': lambda m, n: m + n,
+}
+
+
+def fit_model(points, feature):
+    """
+    Least-squares fit of y = intercept + slope * feature(m, n) to (m, n, y)
+    points. The intercept absorbs fixed costs such as interpreter memory.
+    """
+    xs = [MODELS[feature](m, n) for m, n, _ in points]
+    ys = [y for _, _, y in points]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+
+    sxx = sum((x - x_mean) ** 2 for x in xs)
+    sxy = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    slope = sxy / sxx if sxx else 0.0
+    intercept = y_mean - slope * x_mean
+
+    residuals = [y - (intercept + slope * x) for x, y in zip(xs, ys)]
+    ss_res = sum(r ** 2 for r in residuals)
+    ss_tot = sum((y - y_mean) ** 2 for y in ys)
+
+    return {
+        'feature': feature,
+        'slope': slope,
+        'intercept': intercept,
+        'r2': 1 - ss_res / ss_tot if ss_tot else 1.0,
+        'xs': xs,
+        'residuals': residuals,
+    }
+
+
+def fit_engine(data):
+    """Fit time ~ m*n and the better of memory ~ m+n or m*n for one engine's runs."""
+    time_points = [(d['m'], d['n'], d['time_ms']) for d in data]
+    memory_points = [(d['m'], d['n'], d['memory_kb']) for d in data]
+
+    return {
+        'time': fit_model(time_points, 'm*n'),
+        'memory': max((fit_model(memory_points, feature) for feature in ('m+n', 'm*n')),
+                      key=lambda fit: fit['r2']),
+    }
+
+
+def predict(fit, m, n):
+    return fit['intercept'] + fit['slope'] * MODELS[fit['feature']](m, n)
+
+
+def fit_figure(fits, data_by_engine, quantity, unit, colors):
+    """Measured points, fitted line and residuals of one quantity for every engine."""
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=(f"{quantity.title()} and Fitted Model", "Residuals"),
+        vertical_spacing=0.12
+    )
+
+    for engine, fit in fits.items():
+        model = fit[quantity]
+        key = 'time_ms' if quantity == 'time' else 'memory_kb'
+        order = sorted(range(len(model['xs'])), key=lambda k: model['xs'][k])
+        xs = [model['xs'][k] for k in order]
+
+        fig.add_trace(
+            go.Scatter(
+                x=xs,
+                y=[data_by_engine[engine][k][key] for k in order],
+                mode="markers",
+                name=f"{engine.title()} {quantity}",
+                marker=dict(size=8, color=colors[engine])
+            ),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=xs,
+                y=[model['intercept'] + model['slope'] * x for x in xs],
+                mode="lines",
+                name=f"{engine.title()} fit: {model['intercept']:.3g} + {model['slope']:.3g}·({model['feature']}), "
+                     f"R²={model['r2']:.3f}",
+                line=dict(color=colors[engine], width=2, dash='dash')
+            ),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=xs,
+                y=[model['residuals'][k] for k in order],
+                mode="markers",
+                name=f"{engine.title()} residuals",
+                marker=dict(size=6, color=colors[engine]),
+                showlegend=False
+            ),
+            row=2, col=1
+        )
+
+    fig.update_xaxes(title_text="Model feature (m·n or m+n)", row=1, col=1)
+    fig.update_xaxes(title_text="Model feature (m·n or m+n)", row=2, col=1)
+    fig.update_yaxes(title_text=f"{quantity.title()} ({unit})", row=1, col=1)
+    fig.update_yaxes(title_text=f"Residual ({unit})", row=2, col=1)
+
+    fig.update_layout(
+        title={
+            'text': f"{quantity.title()} Complexity Fit",
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        height=800,
+        template="plotly_white",
+        showlegend=True
+    )
+    return fig
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Plot basic vs efficient results and fit complexity models")
+    parser.add_argument("--predict", nargs=2, type=int, action='append', default=[], metavar=("M", "N"),
+                        help="predict time and memory of an M x N alignment (repeatable)")
+    return parser.parse_args(argv)
+
+
 def main():
+    args = parse_args(sys.argv[1:])
+
     pattern = re.compile(r"^outputin\d+\.txt$")
 
     basic_files = [file_path for file_path in basic_path.iterdir()
@@ -367,6 +494,29 @@ def main():
     )
     size_mem_fig.show()
 
+    # ------------------------- PLOTS 6-7: COMPLEXITY FITS -------------------------
+    data_by_engine = {'basic': basic_data, 'efficient': efficient_data}
+    fits = {engine: fit_engine(data) for engine, data in data_by_engine.items()}
+    colors = {'basic': 'blue', 'efficient': 'red'}
+
+    fit_figure(fits, data_by_engine, 'time', "ms", colors).show()
+    fit_figure(fits, data_by_engine, 'memory', "KB", colors).show()
+
+    print(f"\n{'=' * 80}")
+    print("COMPLEXITY FITS")
+    print(f"{'=' * 80}")
+    for engine, fit in fits.items():
+        for quantity, model in fit.items():
+            print(f"{engine.title():<10} {quantity:<7} {model['intercept']:>12.4g} + {model['slope']:.4g} * "
+                  f"({model['feature']})   R² = {model['r2']:.4f}")
+
+    for m, n in args.predict:
+        print(f"\nPredicted for {m} x {n}:")
+        for engine, fit in fits.items():
+            print(f"  {engine.title():<10} time {predict(fit['time'], m, n):>14.1f} ms   "
+                  f"memory {predict(fit['memory'], m, n):>14.0f} KB")
+    print(f"{'=' * 80}\n")
+
     # ------------------------- STATISTICS -------------------------
     print(f"\n{'=' * 80}")
     print("PERFORMANCE STATISTICS")
@@ -0,0 +1,103 @@
+"""
+Progress and ETA of a long alignment.
+
+    python basic.py input.txt output.txt --progress text
+    python efficient.py input.txt output.txt --progress json
+
+The ETA is the cells still expected divided by the throughput so far. An
+engine adds its expected cells to the total with expect() before it
+starts, and hands each finished row to the active ProgressReporter (see
+active.py) with advance(). The callback sees at most one report per
+interval seconds and a final one when the reporter closes. Hirschberg's
+total is an estimate (see efficient.expected_cells), so its final
+fraction can be slightly off 1.0.
+"""
+import json
+import sys
+import time
+
+from active import ActiveContext
+
+# seconds between two reports
+INTERVAL = 1.0
+
+
+def expect(cells):
+    """Add cells to the total of the active reporter."""
+    reporter = ProgressReporter.active()
+    if reporter is not None:
+        reporter.total += cells
+
+
+class ProgressReporter(ActiveContext):
+    """Throttled callback(report) with the cells done by the engines while it is active."""
+
+    def __init__(self, callback, interval=INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self.total = 0
+        self.done = 0
+        self._start = None
+        self._next = 0.0
+
+    def __enter__(self):
+        self._start = time.monotonic()
+        self._next = self._start + self.interval
+        return super().__enter__()
+
+    def __exit__(self, *exc_info):
+        super().__exit__(*exc_info)
+        if self.done:
+            self.callback(self.report(final=True))
+        return False
+
+    def advance(self, cells):
+        """Count a finished row of cells; reports when the interval has passed."""
+        self.done += cells
+        now = time.monotonic()
+        if now >= self._next:
+            self._next = now + self.interval
+            self.callback(self.report(now))
+
+    def report(self, now=None, final=False) -> dict:
+        elapsed = (now or time.monotonic()) - self._start
+        rate = self.done / elapsed if elapsed > 0 else None
+        remaining = max(self.total - self.done, 0)
+        return {
+            'done': self.done,
+            'total': self.total,
+            'fraction': self.done / self.total if self.total else None,
+            'elapsed_s': elapsed,
+            'cells_per_s': rate,
+            'eta_s': 0.0 if final else (remaining / rate if rate else None),
+            'final': final,
+        }
+
+
+def format_duration(seconds) -> str:
+    if seconds is None:
+        return "?"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def print_text(report, file=None):
+    """One rewritten status line on stderr."""
+    file = file or sys.stderr
+    label = f"{report['input']}: " if 'input' in report else ""
+    fraction = f"{report['fraction']:6.1%}" if report['fraction'] is not None else "     ?"
+    print(f"\r{label}{fraction}  {report['done']:,}/{report['total']:,} cells  "
+          f"{report['cells_per_s'] or 0:,.0f} cells/s  elapsed {format_duration(report['elapsed_s'])}  "
+          f"ETA {format_duration(report['eta_s'])}", end="\n" if report['final'] else "", file=file, flush=True)
+
+
+def print_json(report, file=None):
+    """One JSON object per line on stderr, for job schedulers."""
+    print(json.dumps(report), file=file or sys.stderr, flush=True)
+
+
+PROGRESS_FORMATS = {
+    'text': print_text,
+    'json': print_json,
+}
@@ -0,0 +1,122 @@
+"""
+Per-node trace of the Hirschberg recursion.
+
+    python efficient.py input.txt output.txt --trace trace.jsonl
+    python recursion_trace.py trace.jsonl
+
+One JSON line per node of the recursion tree, written as the node's own
+work finishes: its depth, the bounds and (m, n) of its subproblem, the
+split column k (None for a leaf solved with a full table), the DP cells
+it evaluated and the time that work took, excluding its children. Every
+node evaluates m * n cells, so the cells summed over the tree against the
+root's m * n give the recomputation factor, about 2 for plain Hirschberg
+and less when iterative_hirschberg's cell budget cuts the tree short.
+hirschberg_range and iterative_hirschberg_range record into the active
+RecursionTracer (see active.py); parallel_hirschberg's workers do not.
+"""
+import argparse
+import json
+import os.path
+import sys
+
+from active import ActiveContext
+
+
+class RecursionTracer(ActiveContext):
+    """Recorded recursion nodes of the alignments run while it is active."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.nodes = []
+        self._file = None
+
+    def __enter__(self):
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._file = open(self.path, "w")
+        return super().__enter__()
+
+    def __exit__(self, *exc_info):
+        super().__exit__(*exc_info)
+        if self._file:
+            self._file.close()
+            self._file = None
+        return False
+
+    def record(self, depth, xlo, xhi, ylo, yhi, k, time_ns):
+        m, n = xhi - xlo, yhi - ylo
+        node = {
+            'depth': depth,
+            'xlo': xlo, 'xhi': xhi, 'ylo': ylo, 'yhi': yhi,
+            'm': m, 'n': n,
+            'k': k,
+            'cells': m * n,
+            'time_ms': time_ns / 1e6,
+        }
+        self.nodes.append(node)
+        if self._file:
+            self._file.write(json.dumps(node) + "\n")
+
+    def summary(self) -> dict:
+        return summarize(self.nodes)
+
+
+def read_trace(path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(nodes) -> dict:
+    """
+    Nodes, leaves, cells and time per depth, and the recomputation factor:
+    cells evaluated over all nodes divided by the m * n of the root(s).
+    """
+    depths = {}
+    for node in nodes:
+        level = depths.setdefault(node['depth'], {'depth': node['depth'], 'nodes': 0, 'leaves': 0,
+                                                  'cells': 0, 'time_ms': 0.0})
+        level['nodes'] += 1
+        level['leaves'] += node['k'] is None
+        level['cells'] += node['cells']
+        level['time_ms'] += node['time_ms']
+
+    root_cells = sum(node['cells'] for node in nodes if node['depth'] == 0)
+    cells = sum(level['cells'] for level in depths.values())
+    return {
+        'nodes': len(nodes),
+        'root_cells': root_cells,
+        'cells': cells,
+        'factor': cells / root_cells if root_cells else None,
+        'time_ms': sum(level['time_ms'] for level in depths.values()),
+        'depths': [depths[depth] for depth in sorted(depths)],
+    }
+
+
+def print_summary(summary, file=sys.stdout):
+    print(f"{'Depth':>5} {'Nodes':>8} {'Leaves':>8} {'Cells':>14} {'Share':>7} {'Time (ms)':>12}", file=file)
+    print(f"{'-' * 59}", file=file)
+    for level in summary['depths']:
+        share = level['cells'] / summary['cells'] if summary['cells'] else 0
+        print(f"{level['depth']:>5} {level['nodes']:>8} {level['leaves']:>8} {level['cells']:>14} "
+              f"{share:>7.1%} {level['time_ms']:>12.2f}", file=file)
+    print(f"{'-' * 59}", file=file)
+    factor = f"{summary['factor']:.2f}x" if summary['factor'] is not None else "n/a"
+    print(f"{summary['nodes']} nodes, {summary['cells']} cells for {summary['root_cells']} m*n "
+          f"(recomputation {factor}), {summary['time_ms']:.2f} ms", file=file)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Summarize a Hirschberg recursion trace")
+    parser.add_argument("trace", help="JSON lines written by efficient.py --trace")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    print_summary(summarize(read_trace(args.trace)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Performance regression gate and trend report over benchmark.py results.
+
+    python regression.py benchmark.json --baseline baseline.json
+    python regression.py benchmark.json --save-baseline baseline.json
+    python regression.py --history runs/*.json --report trend.html
+
+Every (engine, m, n) of the current results is compared with the baseline.
+Throughput is judged on the per-repeat cells/second samples: a result
+regresses when its median drops more than --threshold below the baseline
+median and the bootstrap confidence intervals of the two medians do not
+overlap, so a noisy repeat alone never fails the gate. Results whose
+baseline runs take less than MIN_WALL_S are reported but never gated on
+speed, since machine drift alone moves them. Peak memory (one untimed run
+per result) regresses when it grows more than --memory-threshold and by at
+least MEMORY_FLOOR_KB. Results without a usable timing (no repeat took
+measurable time) are reported as 'untimed'. The exit status is 1 if
+anything regressed.
+"""
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+
+# resamples for the bootstrap confidence interval of a median
+BOOTSTRAP = 2000
+
+CONFIDENCE = 0.95
+
+# memory changes smaller than this are allocator noise
+MEMORY_FLOOR_KB = 64
+
+# runs shorter than this (baseline median, seconds) are too noisy to gate
+MIN_WALL_S = 0.01
+
+
+def load_report(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def cells_per_s_samples(result) -> list[float]:
+    return [result['cells'] / wall for wall in result['wall_s'] if wall > 0]
+
+
+def summarize(samples, seed=0):
+    """
+    Median, quartiles and a bootstrap confidence interval of the median, or
+    None without samples.
+    """
+    if not samples:
+        return None
+
+    samples = sorted(samples)
+    if len(samples) > 1:
+        q1, _, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    else:
+        q1 = q3 = samples[0]
+
+    rng = random.Random(seed)
+    medians = sorted(statistics.median(rng.choices(samples, k=len(samples))) for _ in range(BOOTSTRAP))
+    tail = (1 - CONFIDENCE) / 2
+
+    return {
+        'median': statistics.median(samples),
+        'q1': q1,
+        'q3': q3,
+        'iqr': q3 - q1,
+        'ci_low': medians[int(tail * (BOOTSTRAP - 1))],
+        'ci_high': medians[int((1 - tail) * (BOOTSTRAP - 1))],
+    }
+
+
+def result_key(result) -> tuple:
+    return result['engine'], result['m'], result['n']
+
+
+def compare(current, baseline, threshold=0.10, memory_threshold=0.10) -> list[dict]:
+    """One row per current result with its speed and memory verdicts."""
+    baseline_results = {result_key(r): r for r in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        row = {'engine': result['engine'], 'm': result['m'], 'n': result['n'], 'status': 'ok', 'problems': []}
+        base = baseline_results.get(result_key(result))
+        if base is None:
+            row['status'] = 'new'
+            rows.append(row)
+            continue
+
+        now, before = summarize(cells_per_s_samples(result)), summarize(cells_per_s_samples(base))
+        row['cells_per_s'] = now
+        row['baseline_cells_per_s'] = before
+
+        if now is None or before is None:
+            row['status'] = 'untimed'
+        else:
+            row['speed_change'] = now['median'] / before['median'] - 1
+            if statistics.median(base['wall_s']) < MIN_WALL_S:
+                row['status'] = 'short'
+            elif row['speed_change'] < -threshold and now['ci_high'] < before['ci_low']:
+                row['problems'].append('slower')
+            elif row['speed_change'] > threshold and now['ci_low'] > before['ci_high']:
+                row['status'] = 'faster'
+
+        peak, base_peak = result.get('peak_kb'), base.get('peak_kb')
+        if peak is not None and base_peak is not None:
+            row['memory_change'] = peak / base_peak - 1 if base_peak else 0.0
+            if peak > base_peak * (1 + memory_threshold) and peak - base_peak >= MEMORY_FLOOR_KB:
+                row['problems'].append('more memory')
+
+        if row['problems']:
+            row['status'] = 'regression'
+        rows.append(row)
+
+    return rows
+
+
+def print_rows(rows):
+    print(f"{'Engine':<24} {'Size':<14} {'Median cells/s':>16} {'Speed':>8} {'Memory':>8}  Status")
+    print(f"{'-' * 84}")
+    for row in rows:
+        size = f"{row['m']}x{row['n']}"
+        if row['status'] == 'new':
+            print(f"{row['engine']:<24} {size:<14} {'':>16} {'':>8} {'':>8}  new")
+            continue
+        memory = f"{row['memory_change']:+.1%}" if 'memory_change' in row else ''
+        status = row['status'] + (f" ({', '.join(row['problems'])})" if row['problems'] else '')
+        throughput = f"{row['cells_per_s']['median']:.0f}" if row['cells_per_s'] else ''
+        speed = f"{row['speed_change']:+.1%}" if 'speed_change' in row else ''
+        print(f"{row['engine']:<24} {size:<14} {throughput:>16} {speed:>8} {memory:>8}  {status}")
+
+
+def trend_report(paths, output_path, show=False):
+    """Plot cells/s and peak memory of the largest size per engine across runs."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    reports = sorted((load_report(path) for path in paths), key=lambda r: r['meta']['timestamp'])
+    labels = [f"{r['meta']['timestamp']} {(r['meta'].get('commit') or '')[:8]}" for r in reports]
+
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=("Throughput at the largest size", "Peak memory at the largest size"),
+        vertical_spacing=0.12
+    )
+
+    engines = sorted({r['engine'] for report in reports for r in report['results']})
+    for engine in engines:
+        throughput, memory = [], []
+        for report in reports:
+            results = [r for r in report['results'] if r['engine'] == engine]
+            largest = max(results, key=lambda r: r['cells'], default=None)
+            summary = summarize(cells_per_s_samples(largest)) if largest else None
+            throughput.append(summary['median'] if summary else None)
+            memory.append(largest.get('peak_kb') if largest else None)
+
+        fig.add_trace(
+            go.Scatter(
+                x=labels,
+                y=throughput,
+                mode="lines+markers",
+                name=engine,
+                legendgroup=engine,
+                line=dict(width=2),
+                marker=dict(size=6)
+            ),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=labels,
+                y=memory,
+                mode="lines+markers",
+                name=engine,
+                legendgroup=engine,
+                line=dict(width=2),
+                marker=dict(size=6),
+                showlegend=False
+            ),
+            row=2, col=1
+        )
+
+    fig.update_xaxes(title_text="Benchmark run", row=1, col=1)
+    fig.update_xaxes(title_text="Benchmark run", row=2, col=1)
+    fig.update_yaxes(title_text="Cells / second", row=1, col=1)
+    fig.update_yaxes(title_text="Peak memory (KB)", row=2, col=1)
+
+    fig.update_layout(
+        title={
+            'text': "Benchmark History",
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        height=800,
+        template="plotly_white",
+        showlegend=True
+    )
+    fig.write_html(output_path)
+    if show:
+        fig.show()
+    return fig
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Compare benchmark results with a baseline")
+    parser.add_argument("results", nargs='?', help="benchmark.py JSON results to check")
+    parser.add_argument("--baseline", help="baseline results to compare with")
+    parser.add_argument("--save-baseline", metavar="PATH", help="copy the results to PATH as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed drop of median cells/s (default: 0.10)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="allowed growth of peak memory (default: 0.10)")
+    parser.add_argument("--history", nargs='+', default=[], metavar="RESULTS",
+                        help="results of past runs for the trend report")
+    parser.add_argument("--report", default="trend.html", help="trend report file (default: trend.html)")
+    args = parser.parse_args(argv)
+    if not (args.history or args.results and (args.baseline or args.save_baseline)):
+        parser.error("nothing to do: give RESULTS with --baseline or --save-baseline, or --history")
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    failed = False
+
+    if args.results and args.baseline:
+        rows = compare(load_report(args.results), load_report(args.baseline), args.threshold,
+                       args.memory_threshold)
+        print_rows(rows)
+        regressions = [row for row in rows if row['status'] == 'regression']
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+            failed = True
+        else:
+            print(f"\nNo regressions against {args.baseline}")
+
+    if args.results and args.save_baseline:
+        shutil.copyfile(args.results, args.save_baseline)
+        print(f"Saved {args.results} as baseline {args.save_baseline}")
+
+    if args.history:
+        trend_report(args.history + ([args.results] if args.results else []), args.report)
+        print(f"Wrote trend report to {args.report}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
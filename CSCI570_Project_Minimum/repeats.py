@@ -0,0 +1,23 @@
+from alignment import Alignment
+from four_russians import block_alignment
+from sequence import VirtualSequence
+
+
+def repeat_alignment(X, Y, delta, alpha, phrase=4, cache_size=131072, stats=None) -> Alignment:
+    """
+    Repeat-aware alignment for generated inputs. The DP table is tiled along
+    the phrases of each sequence's generation steps (see
+    VirtualSequence.phrase_cuts), so the same few substrings keep meeting the
+    same boundaries and block_alignment's memoized transitions are reused
+    instead of recomputed. Plain strings are cut into fixed phrase-sized
+    blocks. Same cost and traceback as basic.sequence_alignment.
+    If stats is a dict it receives the block_alignment counters; stats['cells']
+    is the number of DP cells actually computed.
+    """
+    if not isinstance(X, VirtualSequence):
+        X = VirtualSequence(str(X), [])
+    if not isinstance(Y, VirtualSequence):
+        Y = VirtualSequence(str(Y), [])
+
+    return block_alignment(X, Y, delta, alpha, X.phrase_cuts(phrase), Y.phrase_cuts(phrase),
+                           cache_size, stats)
@@ -0,0 +1,170 @@
+"""
+Generated input sequences kept in their (base, indices) form.
+
+Every step of generate_string turns s into s[:i + 1] + s + s[i + 1:], so
+the final sequence is fully described by the base string and the list of
+insertion points. A VirtualSequence stores only that description: its
+length is known up front, single characters are found by walking the
+insertion steps back down to the base, and contiguous ranges are produced
+as a stream of chunks without building the whole sequence.
+"""
+
+# characters per chunk when streaming a sequence
+CHUNK_SIZE = 1 << 16
+
+# levels up to this length are built once and sliced directly
+LEVEL_CACHE = 1 << 12
+
+
+class VirtualSequence:
+    """
+    Lazily generated sequence equal to generate_string(base, indices).
+    Compares equal to the str it stands for and can be passed to encode().
+    """
+
+    def __init__(self, base, indices):
+        self.base = base
+        self.indices = list(indices)
+
+        # lengths[k] is the length after k steps, cuts[k] where step k inserts
+        self.lengths = [len(base)]
+        self.cuts = []
+        for i in self.indices:
+            self.cuts.append(min(i + 1, self.lengths[-1]))
+            self.lengths.append(2 * self.lengths[-1])
+
+        self._levels = [base]
+
+    def __len__(self):
+        return self.lengths[-1]
+
+    def char_at(self, p) -> str:
+        """Character at position p, found in O(number of steps)."""
+        for k in range(len(self.indices) - 1, -1, -1):
+            length, cut = self.lengths[k], self.cuts[k]
+            if p < cut:
+                continue
+            if p < cut + length:
+                p -= cut
+            else:
+                p -= length
+        return self.base[p]
+
+    def level(self, k) -> str:
+        """The sequence after k steps, materialized (only used for small levels)."""
+        while len(self._levels) <= k:
+            s, cut = self._levels[-1], self.cuts[len(self._levels) - 1]
+            self._levels.append(s[:cut] + s + s[cut:])
+        return self._levels[k]
+
+    def segments(self, k) -> tuple:
+        """
+        The three (start, end, offset) parts of level k, which is
+        prev[:cut] + prev + prev[cut:]; position p in a part is p - offset in
+        level k - 1.
+        """
+        length, cut = self.lengths[k - 1], self.cuts[k - 1]
+        return (0, cut, 0), (cut, cut + length, cut), (cut + length, 2 * length, length)
+
+    def pieces(self, k, lo, hi):
+        """Yield the characters lo..hi of level k as consecutive base-level slices."""
+        if lo >= hi:
+            return
+        if k == 0 or self.lengths[k] <= LEVEL_CACHE:
+            yield self.level(k)[lo:hi]
+            return
+
+        for start, end, offset in self.segments(k):
+            a, b = max(lo, start), min(hi, end)
+            if a < b:
+                yield from self.pieces(k - 1, a - offset, b - offset)
+
+    def phrase_cuts(self, size) -> list[int]:
+        """
+        Cut positions 0 .. len splitting the sequence into phrases of at most
+        size characters. Phrases follow the insertion steps down to the base
+        string and are then cut at multiples of size there, so the whole
+        sequence is spelled with a handful of distinct base pieces.
+        """
+        cuts = [0]
+
+        def walk(k, lo, hi):
+            if k == 0:
+                p = lo
+                while p < hi:
+                    q = min(hi, (p // size + 1) * size)
+                    cuts.append(cuts[-1] + q - p)
+                    p = q
+                return
+            for start, end, offset in self.segments(k):
+                a, b = max(lo, start), min(hi, end)
+                if a < b:
+                    walk(k - 1, a - offset, b - offset)
+
+        walk(len(self.indices), 0, len(self))
+        return cuts
+
+    def iter_chunks(self, start=0, stop=None, chunk_size=CHUNK_SIZE):
+        """Yield the characters start..stop in strings of about chunk_size."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        pending = []
+        size = 0
+        for piece in self.pieces(len(self.indices), start, stop):
+            pending.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield ''.join(pending)
+                pending = []
+                size = 0
+        if pending:
+            yield ''.join(pending)
+
+    def materialize(self) -> str:
+        """The whole sequence as a str, built in linear time."""
+        return ''.join(self.iter_chunks())
+
+    def encode(self, encoding='ascii', errors='strict') -> bytes:
+        return b''.join(chunk.encode(encoding, errors) for chunk in self.iter_chunks())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.materialize()[index]
+            return ''.join(self.iter_chunks(start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("VirtualSequence index out of range")
+        return self.char_at(index)
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def __str__(self):
+        return self.materialize()
+
+    def __eq__(self, other):
+        if isinstance(other, VirtualSequence):
+            if (self.base, self.indices) == (other.base, other.indices):
+                return True
+            other = other.materialize()
+        if not isinstance(other, str):
+            return NotImplemented
+        if len(other) != len(self):
+            return False
+
+        p = 0
+        for chunk in self.iter_chunks():
+            if other[p:p + len(chunk)] != chunk:
+                return False
+            p += len(chunk)
+        return True
+
+    def __hash__(self):
+        return hash(self.materialize())
+
+    def __repr__(self):
+        return f"VirtualSequence({self.base!r}, {self.indices!r})"
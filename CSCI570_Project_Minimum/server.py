@@ -0,0 +1,272 @@
+"""
+Long-lived alignment server on localhost HTTP.
+
+    python server.py --port 8570 --workers 4
+
+POST /align with a JSON body holding either the two sequences
+    {"x": "ACTG...", "y": "TACG..."}
+or the contents of an input file in the parse_input_file format
+    {"spec": "ACTG\\n3\\n6\\nTACG\\n1\\n"}
+plus optionally "mode" ("basic" or "efficient"), "options" (CLI options
+such as ["--engine", "packed"]) and "format" ("text" or "cigar"). The reply
+holds the cost, the alignment and the request's latency split into queue
+and compute time. GET /stats reports request counts and latency
+percentiles.
+
+Alignments run on a process pool that is started, and has the engines
+imported, before the server accepts connections. At most max_pending
+requests are queued or running at once; further ones get 503 right away.
+Options that write files or stderr reports, or start a pool of their own
+(--profile, --trace, --progress, --workers), get 400. With --cache every
+worker keeps one open ResultCache per file for its whole life.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import basic
+import efficient
+from cache import ResultCache
+
+MODES = {'basic': basic, 'efficient': efficient}
+
+# CLI options a request may not set, with the value that leaves them off
+UNSUPPORTED_OPTIONS = {'profile': None, 'trace': None, 'progress': None, 'workers': 1}
+
+# Per-process result caches by file, opened by worker_cache
+worker_caches = {}
+
+# latencies kept for the /stats percentiles
+LATENCY_WINDOW = 1024
+
+
+def warm_up() -> bool:
+    """Run once per worker so every process is forked before the first request."""
+    return True
+
+
+def worker_cache(path) -> ResultCache:
+    """This process's ResultCache of path, opened by its first request and reused after."""
+    cache = worker_caches.get(path)
+    if cache is None:
+        cache = worker_caches[path] = ResultCache(path)
+    return cache
+
+
+def align_request(mode, options, x, y, output_format) -> dict:
+    """Align one request inside a worker process."""
+    module = MODES[mode]
+    args = module.parse_args(["-", "-", *options])
+    align = module.make_aligner(args, args.cache and worker_cache(args.cache))
+
+    start = time.perf_counter()
+    alignment = align(x, y, basic.DELTA, basic.ALPHA)
+    if output_format == 'cigar':
+        result = {'cost': alignment.cost, 'cigar': alignment.cigar()}
+    else:
+        result = {'cost': alignment.cost, 'aligned_x': alignment.aligned_x, 'aligned_y': alignment.aligned_y}
+    result['compute_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def percentile(values, q) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+
+class AlignmentService:
+    """Worker pool, admission control and latency bookkeeping behind the HTTP handler."""
+
+    def __init__(self, workers=None, max_pending=64):
+        workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        for future in [self.pool.submit(warm_up) for _ in range(workers)]:
+            future.result()
+
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def parse_request(self, body) -> tuple:
+        """Validate a request body; raises ValueError with a message for the client."""
+        mode = body.get('mode', 'basic')
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}")
+        options = body.get('options', [])
+        if not isinstance(options, list) or not all(isinstance(o, str) for o in options):
+            raise ValueError("options must be a list of strings")
+        output_format = body.get('format', 'text')
+        if output_format not in ('text', 'cigar'):
+            raise ValueError(f"unknown format {output_format!r}")
+
+        try:
+            args = MODES[mode].parse_args(["-", "-", *options])
+        except SystemExit:
+            raise ValueError(f"invalid options {options!r}") from None
+        for name, off in UNSUPPORTED_OPTIONS.items():
+            if getattr(args, name, off) != off:
+                raise ValueError(f"option --{name} is not supported by the server")
+
+        if 'spec' in body:
+            try:
+                x, y = basic.parse_input_spec(body['spec'])
+            except (IndexError, ValueError, AttributeError):
+                raise ValueError("malformed spec") from None
+        elif isinstance(body.get('x'), str) and isinstance(body.get('y'), str):
+            x, y = body['x'], body['y']
+        else:
+            raise ValueError("expected 'spec' or string 'x' and 'y'")
+
+        return mode, options, x, y, output_format
+
+    def submit(self, request):
+        """Queue a parsed request, or return None when max_pending are already in flight."""
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            return None
+
+        future = self.pool.submit(align_request, *request)
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def record(self, latency_ms, ok=True):
+        with self.lock:
+            if ok:
+                self.completed += 1
+                self.latencies.append(latency_ms)
+            else:
+                self.failed += 1
+
+    def stats(self) -> dict:
+        with self.lock:
+            latencies = sorted(self.latencies)
+            return {
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'failed': self.failed,
+                'latency_ms': {str(q): percentile(latencies, q) for q in (50, 95, 99)},
+            }
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class AlignmentHandler(BaseHTTPRequestHandler):
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.send_json(200, self.server.service.stats())
+        else:
+            self.send_json(404, {'error': "not found"})
+
+    def do_POST(self):
+        if self.path != "/align":
+            self.send_json(404, {'error': "not found"})
+            return
+
+        received = time.perf_counter()
+        service = self.server.service
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            request = service.parse_request(body)
+        except (ValueError, AttributeError) as e:
+            self.send_json(400, {'error': str(e)})
+            return
+
+        future = service.submit(request)
+        if future is None:
+            self.send_json(503, {'error': "queue full"})
+            return
+
+        try:
+            result = future.result()
+        except Exception as e:
+            service.record(0, ok=False)
+            self.send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+
+        latency_ms = (time.perf_counter() - received) * 1000
+        result['latency_ms'] = latency_ms
+        result['queue_ms'] = max(0.0, latency_ms - result['compute_ms'])
+        service.record(latency_ms)
+        self.send_json(200, result)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AlignmentServer(ThreadingHTTPServer):
+    """HTTP server owning an AlignmentService; port 0 picks a free port."""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, workers=None, max_pending=64, verbose=False):
+        self.service = AlignmentService(workers, max_pending)
+        self.verbose = verbose
+        super().__init__((host, port), AlignmentHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve from a background thread."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        self.service.close()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Local sequence alignment server")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8570)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="requests queued or running before new ones get 503 (default: 64)")
+    parser.add_argument("--verbose", action='store_true', help="log every request")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    server = AlignmentServer(args.host, args.port, args.workers, args.max_pending, args.verbose)
+    print(f"Serving alignments on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from active import ActiveContext
+
+
+class Outer(ActiveContext):
+    pass
+
+
+class Other(ActiveContext):
+    pass
+
+
+class TestActiveContext:
+    """Test making instances current with a with-block"""
+
+    def test_nesting(self):
+        """Test that leaving an inner block restores the outer instance"""
+        assert Outer.active() is None
+        with Outer() as first:
+            with Outer() as second:
+                assert Outer.active() is second
+            assert Outer.active() is first
+        assert Outer.active() is None
+
+    def test_classes_are_separate(self):
+        """Test that each class has its own current instance"""
+        with Outer() as outer:
+            assert Other.active() is None
+            with Other() as other:
+                assert (Outer.active(), Other.active()) == (outer, other)
+
+    def test_exception(self):
+        """Test that an exception leaving the block still restores the previous instance"""
+        try:
+            with Outer():
+                raise ValueError
+        except ValueError:
+            pass
+        assert Outer.active() is None
+
+    def test_deactivate(self):
+        """Test forgetting the current instance"""
+        with Outer():
+            Outer.deactivate()
+            assert Outer.active() is None
@@ -0,0 +1,126 @@
+import os.path
+
+from alignment import (
+    MATCH, GAP_X, GAP_Y, Alignment, append_op, extend_ops, format_cigar_output, iter_row, materialize, ops_from_moves,
+    write_alignment_output,
+)
+from basic import DELTA, ALPHA
+from encoding import cost_matrix, encode
+
+
+class TestRunLengthOps:
+    """Test building run-length op lists"""
+
+    def test_append_merges_runs(self):
+        """Test that equal neighbouring ops share one run"""
+        ops = []
+        for op in [MATCH, MATCH, GAP_X, GAP_X, GAP_X, MATCH]:
+            append_op(ops, op)
+        assert ops == [[MATCH, 2], [GAP_X, 3], [MATCH, 1]]
+
+    def test_extend_merges_boundary(self):
+        """Test that extend only merges where the two lists meet"""
+        ops = [[MATCH, 2], [GAP_Y, 1]]
+        more = [[GAP_Y, 2], [MATCH, 4]]
+        extend_ops(ops, more)
+        assert ops == [[MATCH, 2], [GAP_Y, 3], [MATCH, 4]]
+        assert more == [[GAP_Y, 2], [MATCH, 4]]
+
+    def test_extend_empty(self):
+        """Test extending with nothing"""
+        ops = [[MATCH, 1]]
+        extend_ops(ops, [])
+        assert ops == [[MATCH, 1]]
+
+
+class TestMaterialize:
+    """Test turning ops back into gapped strings"""
+
+    def test_all_ops(self):
+        """Test matches and both kinds of gaps"""
+        x_codes, y_codes = encode("ACTG", "ACGT"), encode("TACG", "ACGT")
+        ops = [[GAP_X, 1], [MATCH, 2], [GAP_Y, 1], [MATCH, 1]]
+        assert materialize(ops, x_codes, y_codes, "ACGT") == ("_ACTG", "TAC_G")
+
+    def test_offsets(self):
+        """Test materializing a sub-range"""
+        x_codes, y_codes = encode("GGAC", "ACGT"), encode("TTAC", "ACGT")
+        assert materialize([[MATCH, 2]], x_codes, y_codes, "ACGT", 2, 2) == ("AC", "AC")
+
+    def test_empty(self):
+        """Test the empty alignment"""
+        assert materialize([], b"", b"", "ACGT") == ("", "")
+
+
+class TestAlignment:
+    """Test the lazy alignment object"""
+
+    def make(self, cost=None):
+        alphabet, costs = cost_matrix(ALPHA)
+        ops = [[GAP_X, 1], [MATCH, 2], [GAP_Y, 1], [MATCH, 1]]
+        return Alignment(ops, encode("ACTG", alphabet), encode("TACG", alphabet), alphabet, DELTA, costs, cost)
+
+    def test_ops_from_moves(self):
+        """Test that back-to-front moves come out as forward runs"""
+        moves = [MATCH, GAP_Y, MATCH, MATCH, GAP_X]
+        assert ops_from_moves(moves) == [[GAP_X, 1], [MATCH, 2], [GAP_Y, 1], [MATCH, 1]]
+
+    def test_cost_from_ops(self):
+        """Test that a missing cost is recomputed from the ops"""
+        alignment = self.make()
+        expected = 2 * DELTA + ALPHA[('A', 'A')] + ALPHA[('C', 'C')] + ALPHA[('G', 'G')]
+        assert alignment.cost == alignment.score() == expected
+
+    def test_strings_are_lazy(self):
+        """Test that the gapped strings are only built on demand"""
+        alignment = self.make(42)
+        assert alignment._strings is None
+        assert (alignment.aligned_x, alignment.aligned_y) == ("_ACTG", "TAC_G")
+
+    def test_unpacks_like_tuple(self):
+        """Test unpacking and comparing against the old tuple form"""
+        alignment = self.make(42)
+        cost, aligned_x, aligned_y = alignment
+        assert (cost, aligned_x, aligned_y) == (42, "_ACTG", "TAC_G")
+        assert alignment == (42, "_ACTG", "TAC_G")
+
+    def test_cigar(self):
+        """Test the CIGAR rendering"""
+        assert self.make().cigar() == "1I2M1D1M"
+
+    def test_cigar_output(self, tmp_path):
+        """Test the compact output file layout"""
+        output_path = os.path.join(tmp_path, "out", "output.txt")
+        format_cigar_output(output_path, 42, "1I2M1D1M", 1.5, 100)
+        with open(output_path) as f:
+            assert f.read().splitlines() == ["42", "1I2M1D1M", "1.5", "100"]
+
+
+class TestStreamingOutput:
+    """Test writing gapped rows straight from the op list"""
+
+    def test_chunks_join_to_materialized_rows(self):
+        """Test that every chunk size gives the materialized rows back"""
+        x_codes, y_codes = encode("ACTGGA", "ACGT"), encode("TACGAA", "ACGT")
+        ops = [[GAP_X, 1], [MATCH, 2], [GAP_Y, 1], [MATCH, 3], [GAP_Y, 1], [GAP_X, 1]]
+        aligned_x, aligned_y = materialize(ops, x_codes, y_codes, "ACGT")
+        for chunk_size in [1, 2, 3, 64]:
+            chunks = list(iter_row(ops, x_codes, GAP_X, "ACGT", chunk_size=chunk_size))
+            assert all(len(chunk) <= chunk_size for chunk in chunks)
+            assert ''.join(chunks) == aligned_x
+            assert ''.join(iter_row(ops, y_codes, GAP_Y, "ACGT", chunk_size=chunk_size)) == aligned_y
+
+    def test_matches_format_output(self, tmp_path):
+        """Test that the streamed file is identical to format_output's"""
+        from basic import format_output, sequence_alignment, generate_string
+
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+        alignment = sequence_alignment(string1, string2, DELTA, ALPHA)
+
+        streamed = os.path.join(tmp_path, "streamed.txt")
+        expected = os.path.join(tmp_path, "expected.txt")
+        write_alignment_output(streamed, alignment.cost, alignment, 1.5, 100, chunk_size=7)
+        format_output(expected, alignment.cost, alignment.aligned_x, alignment.aligned_y, 1.5, 100)
+        with open(streamed) as f, open(expected) as g:
+            assert f.read() == g.read()
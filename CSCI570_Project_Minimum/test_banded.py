@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from basic import DELTA, ALPHA, generate_string, sequence_alignment
+from banded import banded_alignment, banded_fill
+from encoding import cost_matrix, encode
+
+
+class TestBandedFill:
+    """Test the banded DP table"""
+
+    def test_row_widths(self):
+        """Test that each row only stores the cells inside the band"""
+        alphabet, costs = cost_matrix(ALPHA)
+        rows = banded_fill(encode("ACGTACGT", alphabet), encode("ACGTACGT", alphabet), DELTA, costs, 2)
+        assert [len(row) for row in rows] == [3, 4, 5, 5, 5, 5, 5, 4, 3]
+
+    def test_full_band_matches_basic_cost(self):
+        """Test that a band covering the whole table gives the basic cost"""
+        alphabet, costs = cost_matrix(ALPHA)
+        rows = banded_fill(encode("ACTG", alphabet), encode("TGC", alphabet), DELTA, costs, 4)
+        assert rows[4][3] == sequence_alignment("ACTG", "TGC", DELTA, ALPHA)[0]
+
+
+class TestBandedAlignment:
+    """Test the band-doubling engine"""
+
+    def test_empty_strings(self):
+        """Test with empty and one-sided inputs"""
+        assert banded_alignment("", "", DELTA, ALPHA) == (0, "", "")
+        assert banded_alignment("ACG", "", DELTA, ALPHA) == (3 * DELTA, "ACG", "___")
+
+    def test_known_example(self):
+        """Test with the provided example"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = banded_alignment(string1, string2, DELTA, ALPHA)
+        assert cost == 1296
+        assert (cost, aligned1, aligned2) == sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    @pytest.mark.parametrize("band", [1, 2, 4])
+    def test_narrow_start_band_is_exact(self, band, random_pairs):
+        """Test that doubling from a tiny band still finds the basic alignment"""
+        for string1, string2 in random_pairs(band, count=30):
+            assert banded_alignment(string1, string2, DELTA, ALPHA, band) == \
+                sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    def test_near_identical_strings(self):
+        """Test a long pair that differs by a few edits"""
+        rng = random.Random(0)
+        string1 = ''.join(rng.choice("ACGT") for _ in range(400))
+        string2 = string1[:50] + string1[51:300] + "G" + string1[300:]
+        assert banded_alignment(string1, string2, DELTA, ALPHA) == \
+            sequence_alignment(string1, string2, DELTA, ALPHA)
@@ -0,0 +1,91 @@
+import json
+import os.path
+
+import pytest
+
+import basic
+import efficient
+from batch import find_inputs, job_size, output_path_for, parse_args, per_input_path, run_batch
+
+DATAPOINTS = os.path.join(os.path.dirname(__file__), "CSCI570_Project_Minimum_Jul_14", "Datapoints")
+
+
+def write_input(directory, name, content):
+    path = directory / name
+    path.write_text(content)
+    return str(path)
+
+
+class TestFindInputs:
+    """Test collecting the batch's input files"""
+
+    def test_directory_and_glob(self, tmp_path):
+        """Test a directory and an explicit glob"""
+        write_input(tmp_path, "in1.txt", "ACTG\n3\nTACG\n1\n")
+        write_input(tmp_path, "in2.txt", "A\nC\n")
+        write_input(tmp_path, "notes.txt", "")
+        assert [os.path.basename(p) for p in find_inputs(str(tmp_path))] == ["in1.txt", "in2.txt"]
+        assert [os.path.basename(p) for p in find_inputs(str(tmp_path / "*2.txt"))] == ["in2.txt"]
+
+    def test_names_and_sizes(self, tmp_path):
+        """Test output naming and the spec-only job size"""
+        path = write_input(tmp_path, "in7.txt", "ACTG\n3\n6\nTACG\n1\n")
+        assert output_path_for(path, "out") == os.path.join("out", "outputin7.txt")
+        assert per_input_path(os.path.join("prof", "p.json"), path) == os.path.join("prof", "p.in7.json")
+        assert job_size(path) == 16 * 8
+
+
+class TestRunBatch:
+    """Test aligning a directory on a process pool"""
+
+    @pytest.mark.parametrize("mode, cli_args", [("basic", []), ("efficient", ["--engine", "iterative"])])
+    def test_matches_single_file_cli(self, tmp_path, mode, cli_args):
+        """Test that batch outputs match the single-file CLI apart from time and memory"""
+        inputs = [os.path.join(DATAPOINTS, f"in{k}.txt") for k in (1, 2, 3)]
+        results = run_batch(inputs, str(tmp_path / "batch"), mode, cli_args, jobs=2)
+        assert sorted(path for path, _ in results) == sorted(inputs)
+
+        module = basic if mode == "basic" else efficient
+        for input_path in inputs:
+            single = str(tmp_path / "single.txt")
+            args = module.parse_args([input_path, single, *cli_args])
+            module.run(input_path, single, module.make_aligner(args), args.format)
+            with open(output_path_for(input_path, str(tmp_path / "batch"))) as f, open(single) as g:
+                assert f.read().splitlines()[:3] == g.read().splitlines()[:3]
+
+    def test_forwards_cli_options(self, tmp_path):
+        """Test that unknown options reach the per-file CLI"""
+        inputs = [os.path.join(DATAPOINTS, "in1.txt")]
+        run_batch(inputs, str(tmp_path), "basic", ["--format", "cigar"], jobs=1)
+        with open(output_path_for(inputs[0], str(tmp_path))) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 4 and set(lines[1]) <= set("0123456789MID")
+
+    def test_profile_and_trace_per_input(self, tmp_path):
+        """Test that --profile and --trace write one file per input"""
+        inputs = [os.path.join(DATAPOINTS, f"in{k}.txt") for k in (1, 2)]
+        profile, trace = str(tmp_path / "p.json"), str(tmp_path / "t.jsonl")
+        run_batch(inputs, str(tmp_path / "out"), "efficient", ["--profile", profile, "--trace", trace], jobs=2)
+        for input_path in inputs:
+            with open(per_input_path(profile, input_path)) as f:
+                assert json.load(f)['input'] == input_path
+            with open(per_input_path(trace, input_path)) as f:
+                assert json.loads(f.readline())['depth'] == 0
+
+    def test_progress_tagged_with_input(self, tmp_path, capfd):
+        """Test that every job reports its progress under its input's name"""
+        inputs = [os.path.join(DATAPOINTS, f"in{k}.txt") for k in (1, 2)]
+        run_batch(inputs, str(tmp_path), "basic", ["--progress", "json"], jobs=2)
+        reports = [json.loads(line) for line in capfd.readouterr().err.splitlines()]
+        assert {report['input'] for report in reports if report['final']} == {"in1.txt", "in2.txt"}
+
+    def test_rejects_bad_options(self, tmp_path):
+        """Test that invalid forwarded options fail before any job runs"""
+        with pytest.raises(SystemExit):
+            run_batch([], str(tmp_path), "basic", ["--engine", "nope"])
+
+    def test_parse_args(self):
+        """Test splitting batch options from forwarded ones"""
+        args, rest = parse_args(["Datapoints", "Output", "--mode", "efficient", "--jobs", "3", "--engine", "iterative"])
+        assert (args.inputs, args.output_dir, args.mode, args.jobs) == ("Datapoints", "Output", "efficient", 3)
+        assert rest == ["--engine", "iterative"]
@@ -0,0 +1,65 @@
+import json
+import random
+
+import pytest
+
+from basic import generate_string
+from benchmark import ENGINES, make_sequence, parse_args, run_benchmark, size_grid
+
+
+class TestInputs:
+    """Test the generated benchmark inputs"""
+
+    def test_power_of_two_lengths(self):
+        """Test that generated sequences have the requested size"""
+        rng = random.Random(0)
+        for size in [1, 4, 8, 64, 1024]:
+            sequence = make_sequence(size, rng)
+            assert len(sequence) == size
+            assert sequence == generate_string(sequence.base, sequence.indices)
+
+    def test_size_grid(self):
+        """Test the doubling size grid"""
+        assert size_grid(64, 1000) == [64, 128, 256, 512]
+
+
+class TestRunBenchmark:
+    """Test a small benchmark run"""
+
+    def test_results(self):
+        """Test the recorded fields and that all engines agree on the cost"""
+        report = run_benchmark(sorted(ENGINES), [16, 32], warmups=0, repeats=2)
+        assert len(report['results']) == 2 * len(ENGINES)
+        assert report['meta']['repeats'] == 2
+        json.dumps(report)
+
+        for size in [16, 32]:
+            results = [r for r in report['results'] if r['m'] == size]
+            assert len({r['cost'] for r in results}) == 1
+            for result in results:
+                assert result['cells'] == size * size
+                assert len(result['wall_s']) == len(result['cpu_s']) == 2
+                assert result['peak_kb'] > 0 and result['cells_per_s'] > 0
+
+    def test_max_cells(self):
+        """Test skipping inputs above the cell limit"""
+        report = run_benchmark(["basic:dp"], [16, 32, 64], warmups=0, repeats=1, max_cells=32 * 32)
+        assert [r['m'] for r in report['results']] == [16, 32]
+
+    def test_parallel(self):
+        """Test the parallel engine on several workers against the serial stack"""
+        report = run_benchmark(["efficient:iterative", "efficient:parallel"], [256], warmups=0, repeats=1,
+                               workers=2)
+        assert report['meta']['workers'] == 2
+        assert len({r['cost'] for r in report['results']}) == 1
+
+    def test_parse_args(self):
+        """Test the engine filter"""
+        args = parse_args(["--engines", "basic:dp", "efficient:hirschberg", "--max-size", "4096"])
+        assert args.engines == ["basic:dp", "efficient:hirschberg"] and args.max_size == 4096
+
+    @pytest.mark.parametrize("option", ["--repeats", "--workers"])
+    def test_rejects_zero(self, option):
+        """Test that a run without timed runs or processes is refused"""
+        with pytest.raises(SystemExit):
+            parse_args([option, "0"])
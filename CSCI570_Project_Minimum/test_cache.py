@@ -0,0 +1,109 @@
+import time
+
+import efficient
+from alignment import ops_from_cigar
+from basic import DELTA, ALPHA, make_aligner, parse_args, sequence_alignment
+from cache import ResultCache, cache_key
+from sequence import VirtualSequence
+
+
+class TestCacheKey:
+    """Test the content-addressed keys"""
+
+    def test_key_parts(self):
+        """Test that every part of the problem changes the key"""
+        key = cache_key("ACGT", "AC", DELTA, ALPHA, "basic:dp")
+        assert key == cache_key("ACGT", "AC", DELTA, dict(reversed(list(ALPHA.items()))), "basic:dp")
+        assert key != cache_key("ACGT", "AG", DELTA, ALPHA, "basic:dp")
+        assert key != cache_key("ACGT", "AC", DELTA + 1, ALPHA, "basic:dp")
+        assert key != cache_key("ACGT", "AC", DELTA, {**ALPHA, ('A', 'A'): 1}, "basic:dp")
+        assert key != cache_key("ACGT", "AC", DELTA, ALPHA, "efficient:hirschberg:4000000")
+
+    def test_spec_key(self):
+        """Test that generated sequences are keyed by their spec"""
+        x = VirtualSequence("ACTG", [3, 6, 1, 1])
+        assert cache_key(x, "A", DELTA, ALPHA, "e") == cache_key(VirtualSequence("ACTG", [3, 6, 1, 1]), "A",
+                                                                  DELTA, ALPHA, "e")
+
+
+class TestResultCache:
+    """Test the SQLite result cache"""
+
+    def test_cigar_roundtrip(self):
+        """Test parsing a CIGAR string back into runs"""
+        assert ops_from_cigar("1I12M1D1M") == [['I', 1], ['M', 12], ['D', 1], ['M', 1]]
+        assert ops_from_cigar("") == []
+
+    def test_hit_returns_same_alignment(self, tmp_path):
+        """Test that a hit reproduces the computed alignment and counts"""
+        cache = ResultCache(str(tmp_path / "cache.db"))
+        calls = []
+
+        def align(X, Y, delta, alpha):
+            calls.append((X, Y))
+            return sequence_alignment(X, Y, delta, alpha)
+
+        cached = cache.cached(align, "basic:dp")
+        x, y = VirtualSequence("ACTG", [3, 6, 1, 1]), VirtualSequence("TACG", [1, 2, 9, 2])
+        first = cached(x, y, DELTA, ALPHA)
+        second = cached(x, y, DELTA, ALPHA)
+        assert len(calls) == 1
+        assert second == first and second.cost == 1296
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_counters_persist(self, tmp_path):
+        """Test lifetime counters across cache instances"""
+        path = str(tmp_path / "cache.db")
+        cached = ResultCache(path).cached(sequence_alignment, "basic:dp")
+        cached("ACGT", "AC", DELTA, ALPHA)
+        cache = ResultCache(path)
+        cache.cached(sequence_alignment, "basic:dp")("ACGT", "AC", DELTA, ALPHA)
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["total_hits"], stats["total_misses"]) == (1, 0, 1, 1)
+        cache.clear()
+        assert cache.stats()["entries"] == cache.stats()["total_misses"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries go first"""
+        cache = ResultCache(str(tmp_path / "cache.db"), max_bytes=6)
+        cached = cache.cached(sequence_alignment, "basic:dp")
+        cached("ACGT", "ACGT", DELTA, ALPHA)                # 4M
+        time.sleep(0.01)
+        cached("AC", "AC", DELTA, ALPHA)                    # 2M
+        time.sleep(0.01)
+        cached("ACGT", "ACGT", DELTA, ALPHA)                # hit, now the most recent
+        time.sleep(0.01)
+        cached("ACGTACGTAC", "ACGTACGTAC", DELTA, ALPHA)    # 10M, 7 bytes in total
+
+        assert cache.stats()["bytes"] == 5
+        assert cache.get(cache_key("AC", "AC", DELTA, ALPHA, "basic:dp"), "AC", "AC", DELTA, ALPHA) is None
+        assert cache.get(cache_key("ACGT", "ACGT", DELTA, ALPHA, "basic:dp"), "ACGT", "ACGT", DELTA, ALPHA) \
+            is not None
+
+    def test_cli_option(self, tmp_path):
+        """Test wiring the cache in through --cache"""
+        path = str(tmp_path / "cache.db")
+        align = make_aligner(parse_args(["in.txt", "out.txt", "--cache", path]))
+        assert align("ACGT", "AC", DELTA, ALPHA) == sequence_alignment("ACGT", "AC", DELTA, ALPHA)
+        assert ResultCache(path).stats()["entries"] == 1
+
+    def test_efficient_keys(self, tmp_path):
+        """Test that a --workers run never answers a plain hirschberg run"""
+        path = str(tmp_path / "cache.db")
+        x, y = "ACACACTGACTACTGACTGGTGACTACTGACTGG", "TTATTATACGCTATTATACGCGACGCGGACGCG"
+
+        parallel = efficient.make_aligner(efficient.parse_args(["in.txt", "out.txt", "--engine", "iterative",
+                                                                "--workers", "2", "--cache", path]))
+        parallel(x, y, DELTA, ALPHA)
+        plain = efficient.make_aligner(efficient.parse_args(["in.txt", "out.txt", "--cache", path]))
+        assert plain(x, y, DELTA, ALPHA).strings() == efficient.hirschberg(x, y, DELTA, ALPHA).strings()
+        assert ResultCache(path).stats()["entries"] == 2
+
+    def test_engine_names(self):
+        """Test that only options changing the alignment are part of the name"""
+        def name(*argv):
+            return efficient.engine_name(efficient.parse_args(["in.txt", "out.txt", *argv]))
+
+        assert name() == name("--cell-budget", "10") == "efficient:hirschberg"
+        assert name("--engine", "iterative", "--cell-budget", "10") == "efficient:iterative:10"
+        assert name("--engine", "iterative", "--workers", "4") == "efficient:parallel:4000000"
@@ -0,0 +1,36 @@
+import pytest
+
+from basic import DELTA, ALPHA, generate_string, sequence_alignment, parse_args
+from checkpoint import checkpoint_alignment
+
+
+class TestCheckpointAlignment:
+    """Test the sqrt-space checkpointed traceback engine"""
+
+    def test_empty_strings(self):
+        """Test with empty and one-sided inputs"""
+        assert checkpoint_alignment("", "", DELTA, ALPHA) == (0, "", "")
+        assert checkpoint_alignment("", "AC", DELTA, ALPHA) == (2 * DELTA, "__", "AC")
+        assert checkpoint_alignment("AC", "", DELTA, ALPHA) == (2 * DELTA, "AC", "__")
+
+    def test_known_example(self):
+        """Test with the provided example"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = checkpoint_alignment(string1, string2, DELTA, ALPHA)
+        assert cost == 1296
+        assert (cost, aligned1, aligned2) == sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    @pytest.mark.parametrize("interval", [None, 1, 3, 7, 100])
+    def test_interval_does_not_change_alignment(self, interval, random_pairs):
+        """Test that every checkpoint interval reproduces the basic alignment"""
+        for string1, string2 in random_pairs(interval or 0):
+            assert checkpoint_alignment(string1, string2, DELTA, ALPHA, interval) == \
+                sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    def test_cli_interval(self):
+        """Test the --checkpoint-interval option"""
+        args = parse_args(["in.txt", "out.txt", "--engine", "checkpoint", "--checkpoint-interval", "64"])
+        assert args.engine == "checkpoint"
+        assert args.checkpoint_interval == 64
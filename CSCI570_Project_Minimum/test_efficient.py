@@ -5,9 +5,23 @@ import pytest
 import sys
 from pathlib import  Path
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from alignment import materialize
+from encoding import cost_matrix, encode
+import efficient
 from efficient import (
+    BlockedScorePass,
     generate_string,
     hirschberg,
+    hirschberg_range,
+    iterative_hirschberg,
+    parallel_hirschberg,
+    parse_args,
+    get_optimal_split_point,
+    run_score_passes,
+    score_pass,
+    split_point,
     calculate_alignment_cost,
     parse_input_file,
     process_memory,
@@ -394,6 +408,129 @@ class TestIntegration:
             # Don't assert exact time/memory match as they vary by system
             print(f"✓ {file_path.name} passed (cost: {cost})")
 
+class TestIndexRanges:
+    """Test the recursion helpers that work on index ranges of one buffer"""
+
+    def test_split_point_on_sub_range(self):
+        """Test that a sub-range gives the same split as the sliced strings"""
+        alphabet, costs = cost_matrix(ALPHA)
+        string1, string2 = "GGACTGACTTT", "CCTACGTACGAA"
+        x_codes, y_codes = encode(string1, alphabet), encode(string2, alphabet)
+
+        k = split_point(x_codes, y_codes, 2, 8, 2, 10, DELTA, costs)
+        assert k == 2 + get_optimal_split_point(string1[2:8], string2[2:10], DELTA, ALPHA)
+
+    def test_hirschberg_range_matches_slices(self):
+        """Test aligning a sub-range without slicing"""
+        alphabet, costs = cost_matrix(ALPHA)
+        string1, string2 = "GGACTGACTTT", "CCTACGTACGAA"
+        x_codes, y_codes = encode(string1, alphabet), encode(string2, alphabet)
+
+        ops = []
+        cost = hirschberg_range(x_codes, y_codes, 2, 8, 2, 10, DELTA, costs, ops)
+        result = (cost, *materialize(ops, x_codes, y_codes, alphabet, 2, 2))
+        assert result == hirschberg(string1[2:8], string2[2:10], DELTA, ALPHA)
+
+    def test_compact_form(self):
+        """Test that the op list describes the same alignment as the strings"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+        alphabet, _ = cost_matrix(ALPHA)
+
+        alignment = hirschberg(string1, string2, DELTA, ALPHA)
+        ops = alignment.ops
+        assert (alignment.cost, *materialize(ops, encode(string1, alphabet), encode(string2, alphabet), alphabet)) == \
+            tuple(alignment)
+        # runs are merged, so neighbouring runs never share an op
+        assert all(a[0] != b[0] for a, b in zip(ops, ops[1:]))
+
+
+class TestIterativeHirschberg:
+    """Test the explicit-stack Hirschberg with a cell budget"""
+
+    def test_zero_budget_matches_recursion(self):
+        """Test that a zero budget reproduces the recursive alignment"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+        assert iterative_hirschberg(string1, string2, DELTA, ALPHA, 0) == \
+            hirschberg(string1, string2, DELTA, ALPHA)
+
+    @pytest.mark.parametrize("cell_budget", [16, 500, 4_000_000])
+    def test_budget_keeps_optimal_cost(self, cell_budget):
+        """Test that leaf solves of any size keep the optimal cost"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = iterative_hirschberg(string1, string2, DELTA, ALPHA, cell_budget)
+        assert cost == 1296
+        assert calculate_alignment_cost(aligned1, aligned2, DELTA, ALPHA) == cost
+        assert aligned1.replace('_', '') == string1
+        assert aligned2.replace('_', '') == string2
+
+    def test_empty_strings(self):
+        """Test with empty strings"""
+        assert iterative_hirschberg("", "", DELTA, ALPHA) == (0, "", "")
+        assert iterative_hirschberg("AC", "", DELTA, ALPHA) == (2 * DELTA, "AC", "__")
+
+    def test_cli_options(self):
+        """Test --engine and --cell-budget parsing"""
+        args = parse_args(["in.txt", "out.txt", "--engine", "iterative", "--cell-budget", "1000"])
+        assert args.engine == "iterative"
+        assert args.cell_budget == 1000
+        assert parse_args(["in.txt", "out.txt"]).engine == "hirschberg"
+
+
+class TestParallelHirschberg:
+    """Test the process-pool Hirschberg"""
+
+    @pytest.mark.parametrize("cell_budget", [0, 64])
+    def test_matches_iterative(self, cell_budget):
+        """Test that the pool gives the same alignment as the serial stack"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+        assert parallel_hirschberg(string1, string2, DELTA, ALPHA, workers=2, cell_budget=cell_budget) == \
+            iterative_hirschberg(string1, string2, DELTA, ALPHA, cell_budget)
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_split_passes_match_iterative(self, workers):
+        """Test that score passes cut into block pipelines give the same alignment"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+        assert parallel_hirschberg(string1, string2, DELTA, ALPHA, workers=workers, cell_budget=64,
+                                   pass_block=8) == iterative_hirschberg(string1, string2, DELTA, ALPHA, 64)
+
+    @pytest.mark.parametrize("flag", [0, 1])
+    def test_blocked_score_pass(self, flag):
+        """Test that a pass run block by block returns score_pass's last row"""
+        alphabet, costs = cost_matrix(ALPHA)
+        x_codes = encode(generate_string("ACTG", [3, 6, 1]), alphabet)
+        y_codes = encode(generate_string("TACG", [1, 2, 9]), alphabet)
+        efficient.worker_state.update(x_codes=x_codes, y_codes=y_codes, delta=DELTA, costs=costs)
+        try:
+            blocked = BlockedScorePass(2, 30, 1, 29, flag, DELTA, workers=3, block=4)
+            with ThreadPoolExecutor(3) as pool:
+                run_score_passes(pool, [blocked])
+        finally:
+            efficient.worker_state.clear()
+        assert (len(blocked.lefts), len(blocked.tops)) == (7, 3)
+        assert blocked.last_row() == score_pass(x_codes, y_codes, 2, 30, 1, 29, DELTA, costs, flag)
+
+    def test_empty_strings(self):
+        """Test that empty inputs still allocate and release shared memory"""
+        assert parallel_hirschberg("", "", DELTA, ALPHA, workers=2) == (0, "", "")
+        assert parallel_hirschberg("", "AC", DELTA, ALPHA, workers=2) == (2 * DELTA, "__", "AC")
+
+    def test_cli_workers(self):
+        """Test --workers parsing"""
+        assert parse_args(["in.txt", "out.txt", "--engine", "iterative", "--workers", "8"]).workers == 8
+        assert parse_args(["in.txt", "out.txt"]).workers == 1
+
+    def test_cli_workers_needs_iterative(self):
+        """Test that --workers is not silently run instead of recursive hirschberg"""
+        with pytest.raises(SystemExit):
+            parse_args(["in.txt", "out.txt", "--workers", "8"])
+
+
 class TestMemoryAndTime:
     """Test memory and time measurement functions"""
 
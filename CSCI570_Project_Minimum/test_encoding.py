@@ -0,0 +1,45 @@
+import pytest
+
+from basic import ALPHA
+from encoding import cost_matrix, encode, decode
+
+
+class TestCostMatrix:
+    """Test the dense cost matrix built from ALPHA"""
+
+    def test_alphabet_order(self):
+        """Test that codes follow the sorted alphabet"""
+        alphabet, costs = cost_matrix(ALPHA)
+        assert alphabet == "ACGT"
+        assert len(costs) == 4 and all(len(row) == 4 for row in costs)
+
+    def test_matrix_matches_alpha(self):
+        """Test every entry against the tuple-keyed dict"""
+        alphabet, costs = cost_matrix(ALPHA)
+        for (a, b), value in ALPHA.items():
+            assert costs[alphabet.index(a)][alphabet.index(b)] == value
+
+    def test_general_alphabet(self):
+        """Test a non-DNA alphabet"""
+        alphabet, costs = cost_matrix({('X', 'X'): 0, ('X', 'Y'): 5, ('Y', 'X'): 7, ('Y', 'Y'): 1})
+        assert alphabet == "XY"
+        assert costs == [[0, 5], [7, 1]]
+
+
+class TestEncode:
+    """Test sequence encoding"""
+
+    def test_round_trip(self):
+        """Test that decode inverts encode"""
+        codes = encode("GATTACA", "ACGT")
+        assert list(codes) == [2, 0, 3, 3, 0, 1, 0]
+        assert decode(codes, "ACGT") == "GATTACA"
+
+    def test_empty_sequence(self):
+        """Test the empty sequence"""
+        assert encode("", "ACGT") == b""
+
+    def test_unknown_character(self):
+        """Test that characters outside the alphabet are rejected"""
+        with pytest.raises(ValueError):
+            encode("ACGN", "ACGT")
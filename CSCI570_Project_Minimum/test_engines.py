@@ -0,0 +1,16 @@
+import pytest
+
+import basic
+from basic import DELTA, ALPHA, sequence_alignment
+
+
+class TestEngines:
+    """Test every basic.py engine against the plain DP"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("name", sorted(set(basic.ENGINES) - {'dp'}))
+    def test_matches_basic_traceback(self, name, seed, random_pairs):
+        """Test that random pairs give exactly the basic alignment, traceback included"""
+        for string1, string2 in random_pairs(seed):
+            assert basic.ENGINES[name](string1, string2, DELTA, ALPHA) == \
+                sequence_alignment(string1, string2, DELTA, ALPHA)
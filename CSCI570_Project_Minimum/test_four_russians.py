@@ -0,0 +1,66 @@
+import pytest
+
+from basic import DELTA, ALPHA, generate_string, sequence_alignment, parse_args
+from encoding import cost_matrix
+from four_russians import block_values, block_alignment, four_russians_alignment, row_corners
+
+
+class TestBlockValues:
+    """Test filling a single block from its boundary"""
+
+    def test_matches_full_table(self):
+        """Test a block at the origin against the basic cost"""
+        alphabet, costs = cost_matrix(ALPHA)
+        rows = block_values(bytes([0, 1, 3]), bytes([3, 0]), 0, (DELTA, DELTA), (DELTA, DELTA, DELTA),
+                            DELTA, costs)
+        assert len(rows) == 4 and len(rows[0]) == 3
+        assert rows[-1][-1] == sequence_alignment("ACT", "TA", DELTA, ALPHA)[0]
+
+    def test_row_corners(self):
+        """Test the running top-left values along a block row"""
+        assert row_corners(60, [(30, 30), (-10,), (30, 0, 30)]) == [60, 120, 110, 170]
+        assert row_corners(0, []) == [0]
+
+
+class TestFourRussiansAlignment:
+    """Test the memoized block engine"""
+
+    def test_empty_strings(self):
+        """Test with empty and one-sided inputs"""
+        assert four_russians_alignment("", "", DELTA, ALPHA) == (0, "", "")
+        assert four_russians_alignment("ACG", "", DELTA, ALPHA) == (3 * DELTA, "ACG", "___")
+        assert four_russians_alignment("", "ACG", DELTA, ALPHA) == (3 * DELTA, "___", "ACG")
+
+    def test_known_example(self):
+        """Test with the provided example"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = four_russians_alignment(string1, string2, DELTA, ALPHA)
+        assert cost == 1296
+        assert (cost, aligned1, aligned2) == sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    @pytest.mark.parametrize("block", [1, 3, 4, 8])
+    def test_block_size_does_not_change_alignment(self, block, random_pairs):
+        """Test that every block size reproduces the basic alignment"""
+        for string1, string2 in random_pairs(block):
+            assert four_russians_alignment(string1, string2, DELTA, ALPHA, block) == \
+                sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    def test_repeated_blocks_hit_cache(self):
+        """Test that periodic inputs reuse block transitions"""
+        stats = {}
+        four_russians_alignment("ACGT" * 16, "ACGT" * 16, DELTA, ALPHA, 4, stats=stats)
+        assert stats["blocks"] == 256
+        assert stats["hits"] > 0
+        assert stats["hits"] + stats["misses"] == stats["blocks"]
+
+    def test_uneven_cuts(self):
+        """Test block_alignment with arbitrary cut positions"""
+        string1, string2 = "ACTGACTGGA", "TACGTTAC"
+        assert block_alignment(string1, string2, DELTA, ALPHA, [0, 1, 5, 10], [0, 7, 8]) == \
+            sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    def test_cli_engine(self):
+        """Test selecting the engine from the CLI"""
+        assert parse_args(["in.txt", "out.txt", "--engine", "four-russians"]).engine == "four-russians"
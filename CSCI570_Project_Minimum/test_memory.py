@@ -0,0 +1,41 @@
+import pytest
+
+from basic import DELTA, ALPHA, parse_args, sequence_alignment
+from memory import MemoryMonitor
+
+
+class TestMemoryMonitor:
+    """Test measuring the memory of one block"""
+
+    def test_sees_peak_of_freed_allocation(self):
+        """Test that a peak released before the block ends is still reported"""
+        with MemoryMonitor(trace=True) as monitor:
+            block = bytearray(64 << 20)
+            block[::4096] = b"x" * len(block[::4096])
+            del block
+        assert monitor.peak_delta_kb >= 60 << 10
+        assert monitor.traced_peak_kb >= 64 << 10
+        assert monitor.final_rss_kb < monitor.peak_rss_kb
+
+    def test_report(self):
+        """Test the reported fields without tracing"""
+        with MemoryMonitor() as monitor:
+            sequence_alignment("ACGT" * 20, "TGCA" * 20, DELTA, ALPHA)
+        report = monitor.report()
+        assert report['traced_peak_kb'] is None
+        assert report['peak_rss_kb'] >= report['baseline_kb'] > 0
+        assert report['peak_delta_kb'] == report['peak_rss_kb'] - report['baseline_kb']
+
+    @pytest.mark.parametrize("mode", ["peak", "traced", "rss"])
+    def test_value_modes(self, mode):
+        """Test the number written to the memory line"""
+        with MemoryMonitor(trace=mode == "traced") as monitor:
+            sequence_alignment("ACGT", "TGCA", DELTA, ALPHA)
+        expected = {"peak": monitor.peak_delta_kb, "traced": int(monitor.traced_peak_kb or 0),
+                    "rss": monitor.final_rss_kb}[mode]
+        assert monitor.value(mode) == expected
+
+    def test_cli_option(self):
+        """Test choosing the memory line from the CLI"""
+        assert parse_args(["in.txt", "out.txt"]).memory == "peak"
+        assert parse_args(["in.txt", "out.txt", "--memory", "traced"]).memory == "traced"
@@ -0,0 +1,58 @@
+import basic
+import efficient
+import metrics
+from metrics import metrics_path, read_metrics, scan_output_file, write_metrics
+
+INPUT = "CSCI570_Project_Minimum_Jul_14/Datapoints/in3.txt"
+
+
+class TestSidecar:
+    """Test writing and reading metrics sidecars"""
+
+    def test_path(self):
+        """Test that the sidecar sits next to the output file"""
+        assert metrics_path("out/outputin3.txt") == "out/outputin3.metrics.json"
+
+    def test_round_trip(self, tmp_path):
+        """Test reading back what was written"""
+        output_path = str(tmp_path / "outputin1.txt")
+        write_metrics(output_path, m=3, n=4, cost=7)
+        assert read_metrics(output_path) == {'m': 3, 'n': 4, 'cost': 7}
+
+    def test_missing(self, tmp_path):
+        """Test a run without a sidecar"""
+        assert read_metrics(str(tmp_path / "outputin1.txt")) is None
+
+    def test_runs_write_sidecars(self, tmp_path):
+        """Test that basic and efficient runs agree with their output files"""
+        for module in (basic, efficient):
+            output_path = str(tmp_path / f"{module.__name__}.txt")
+            module.run(INPUT, output_path, module.make_aligner(module.parse_args([INPUT, output_path])),
+                       engine=f"{module.__name__}:test")
+            sidecar = read_metrics(output_path)
+            scanned = scan_output_file(output_path)
+
+            assert sidecar['engine'] == f"{module.__name__}:test"
+            assert (sidecar['m'], sidecar['n']) == (64, 64)
+            for key in ('m', 'n', 'aligned_length', 'cost'):
+                assert sidecar[key] == scanned[key]
+            assert 'align' in sidecar['phases_ms']
+            assert sidecar['memory']['peak_delta_kb'] == sidecar['memory_kb']
+
+
+class TestScanOutputFile:
+    """Test scanning legacy five-line output files"""
+
+    def test_rows_longer_than_chunk(self, tmp_path, monkeypatch):
+        """Test that rows are counted across many chunks"""
+        monkeypatch.setattr(metrics, 'SCAN_CHUNK', 7)
+        path = tmp_path / "outputin1.txt"
+        path.write_text("42\n" + "A_" * 50 + "\n" + "AC" * 50 + "\n12.5\n4096\n")
+        assert scan_output_file(path) == {'m': 50, 'n': 100, 'aligned_length': 100, 'cost': 42,
+                                          'time_ms': 12.5, 'memory_kb': 4096.0}
+
+    def test_not_five_lines(self, tmp_path):
+        """Test that a CIGAR output file is not mistaken for one"""
+        path = tmp_path / "outputin1.txt"
+        path.write_text("42\n3M1I\n12.5\n4096\n")
+        assert scan_output_file(path) is None
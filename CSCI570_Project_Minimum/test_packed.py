@@ -0,0 +1,23 @@
+from basic import DELTA, ALPHA, generate_string, sequence_alignment
+from packed import packed_alignment
+
+
+class TestPackedAlignment:
+    """Test the rolling-row engine with a 2-bit direction matrix"""
+
+    def test_empty_strings(self):
+        """Test with empty strings"""
+        assert packed_alignment("", "", DELTA, ALPHA) == (0, "", "")
+
+    def test_single_character_mismatch(self):
+        """Test that two gaps beat an expensive mismatch"""
+        assert packed_alignment("A", "C", DELTA, ALPHA) == sequence_alignment("A", "C", DELTA, ALPHA)
+
+    def test_known_example(self):
+        """Test with the provided example"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = packed_alignment(string1, string2, DELTA, ALPHA)
+        assert cost == 1296
+        assert (cost, aligned1, aligned2) == sequence_alignment(string1, string2, DELTA, ALPHA)
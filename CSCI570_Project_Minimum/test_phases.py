@@ -0,0 +1,91 @@
+import json
+import os.path
+
+import pytest
+
+import basic
+import efficient
+from basic import DELTA, ALPHA, sequence_alignment
+from phases import PhaseTimer, count, phase, timed
+
+DATAPOINTS = os.path.join(os.path.dirname(__file__), "CSCI570_Project_Minimum_Jul_14", "Datapoints")
+
+
+class TestPhaseTimer:
+    """Test the phase timers"""
+
+    def test_nested_phases(self):
+        """Test nested names, call counts and counters"""
+
+        @timed('inner')
+        def inner():
+            count('cells', 3)
+
+        with PhaseTimer() as timer:
+            with phase('outer'):
+                inner()
+                inner()
+        assert set(timer.phases) == {'outer', 'outer/inner'}
+        assert timer.phases['outer'] >= timer.phases['outer/inner'] > 0
+        assert timer.calls == {'outer': 1, 'outer/inner': 2}
+        assert timer.counters == {'cells': 6}
+
+    def test_inactive_is_noop(self):
+        """Test that nothing is recorded outside a timer"""
+        timer = PhaseTimer()
+        with phase('outer'):
+            count('cells', 3)
+        assert timer.phases == {} and timer.counters == {}
+
+    def test_engine_phases(self):
+        """Test that the basic engine reports its fill and traceback"""
+        with PhaseTimer() as timer:
+            sequence_alignment("ACGTAC", "TGCA", DELTA, ALPHA)
+        assert {'encode', 'fill', 'traceback'} <= set(timer.phases)
+        assert timer.counters['cells'] == 24
+
+    @pytest.mark.parametrize("engine", sorted(basic.ENGINES))
+    def test_every_engine_profiles(self, engine):
+        """Test that every basic engine reports its fill, traceback and cells"""
+        X, Y = "ACGTACGGTACAT" * 3, "TGCATGCAAGT" * 3
+        with PhaseTimer() as timer:
+            basic.ENGINES[engine](X, Y, DELTA, ALPHA)
+        assert {'fill', 'traceback'} <= set(timer.phases)
+        expected = {'dp': 1, 'wavefront': 1, 'packed': 1, 'checkpoint': 2}
+        if engine in expected:
+            assert timer.counters['cells'] == expected[engine] * len(X) * len(Y)
+        else:
+            assert timer.counters['cells'] > 0
+
+
+class TestProfileOption:
+    """Test the --profile sidecar"""
+
+    def test_basic_profile(self, tmp_path):
+        """Test the phases written by basic.py"""
+        profile_path = str(tmp_path / "profile.json")
+        input_path = os.path.join(DATAPOINTS, "in1.txt")
+        args = basic.parse_args([input_path, str(tmp_path / "out.txt"), "--profile", profile_path])
+        basic.run(args.input_file, args.output_file, basic.make_aligner(args), args.format, args.memory,
+                  args.profile)
+
+        with open(profile_path) as f:
+            profile = json.load(f)
+        assert {'parse', 'align', 'align/fill', 'align/traceback', 'verify', 'write'} <= set(profile['phases_ns'])
+        assert profile['counters']['cells'] == profile['m'] * profile['n']
+        assert profile['memory']['peak_rss_kb'] >= profile['memory']['baseline_kb'] > 0
+
+    def test_efficient_profile(self, tmp_path):
+        """Test that Hirschberg reports its score passes and leaves"""
+        profile_path = str(tmp_path / "profile.json")
+        input_path = os.path.join(DATAPOINTS, "in2.txt")
+        args = efficient.parse_args([input_path, str(tmp_path / "out.txt"), "--profile", profile_path])
+        efficient.run(args.input_file, args.output_file, efficient.make_aligner(args), args.format, args.memory,
+                      args.profile)
+
+        with open(profile_path) as f:
+            profile = json.load(f)
+        assert profile['calls']['align/score_pass'] > 0
+        assert profile['calls']['align/leaf'] > 0
+        # Hirschberg computes about twice the cells of the full table
+        assert profile['counters']['cells'] >= profile['m'] * profile['n']
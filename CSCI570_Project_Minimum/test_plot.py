@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+pytest.importorskip("plotly")
+
+from plot import fit_engine, fit_model, predict, read_output_files
+
+
+def make_run(m, n, time_ms, memory_kb):
+    return {'m': m, 'n': n, 'time_ms': time_ms, 'memory_kb': memory_kb}
+
+
+class TestFitModel:
+    """Test the least-squares complexity fits"""
+
+    def test_exact_quadratic(self):
+        """Test that time = 5 + 0.002 m n is recovered exactly"""
+        points = [(m, m, 5 + 0.002 * m * m) for m in (100, 200, 400, 800)]
+        fit = fit_model(points, 'm*n')
+        assert fit['slope'] == pytest.approx(0.002)
+        assert fit['intercept'] == pytest.approx(5)
+        assert fit['r2'] == pytest.approx(1)
+        assert all(abs(r) < 1e-6 for r in fit['residuals'])
+
+    def test_constant_values(self):
+        """Test that identical measurements give a flat, perfect fit"""
+        fit = fit_model([(10, 10, 7.0), (20, 20, 7.0)], 'm+n')
+        assert fit['slope'] == 0
+        assert fit['r2'] == 1.0
+
+    def test_predict(self):
+        """Test prediction at an unseen size"""
+        fit = fit_model([(m, m, 3 * (m + m)) for m in (10, 20, 40)], 'm+n')
+        assert predict(fit, 1000, 500) == pytest.approx(4500)
+
+
+class TestFitEngine:
+    """Test picking the memory model per engine"""
+
+    def test_linear_memory(self):
+        """Test that memory growing with m + n picks the linear model"""
+        data = [make_run(m, m, 0.001 * m * m, 40000 + 2 * (m + m)) for m in (100, 300, 500, 1000, 2000)]
+        fits = fit_engine(data)
+        assert fits['time']['feature'] == 'm*n'
+        assert fits['memory']['feature'] == 'm+n'
+
+    def test_quadratic_memory(self):
+        """Test that memory growing with m * n picks the quadratic model"""
+        data = [make_run(m, m, 0.001 * m * m, 40000 + 0.01 * m * m) for m in (100, 300, 500, 1000, 2000)]
+        assert fit_engine(data)['memory']['feature'] == 'm*n'
+
+
+class TestReadOutputFiles:
+    """Test the sequence lengths read from output files"""
+
+    def test_lengths_without_gaps(self, tmp_path):
+        """Test that m and n exclude the gap characters"""
+        path = tmp_path / "output1.txt"
+        path.write_text("12\nAC_GT\nA_CGT\n1.5\n40000\n")
+        [run] = read_output_files([path])
+        assert (run['m'], run['n']) == (4, 4)
+        assert (run['len1'], run['len2']) == (5, 5)
+
+    def test_prefers_sidecar(self, tmp_path):
+        """Test that the sidecar is read instead of the output file"""
+        path = tmp_path / "outputin1.txt"
+        path.write_text("12\nAC_GT\nA_CGT\n1.5\n40000\n")
+        (tmp_path / "outputin1.metrics.json").write_text(json.dumps({
+            'engine': "basic:dp", 'm': 4, 'n': 4, 'aligned_length': 5, 'cost': 12,
+            'time_ms': 2.5, 'memory_kb': 80}))
+        [run] = read_output_files([path])
+        assert (run['engine'], run['time_ms'], run['memory_kb']) == ("basic:dp", 2.5, 80)
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+import basic
+from basic import DELTA, ALPHA, sequence_alignment
+from efficient import expected_cells, hirschberg, iterative_hirschberg, parallel_hirschberg
+from progress import ProgressReporter, expect, print_json, print_text
+
+X = "ACACTGACTACTGACTGGTGACTACTGACTGG" * 4
+Y = "TATTATACGCTATTATACGCGACGCGGACGCG" * 4
+
+
+class TestProgressReporter:
+    """Test the throttled progress callbacks"""
+
+    def test_inactive(self):
+        """Test that engines run without a reporter"""
+        expect(100)
+        assert ProgressReporter.active() is None
+        assert sequence_alignment(X, Y, DELTA, ALPHA).cost > 0
+
+    def test_basic_rows(self):
+        """Test one report per row with no throttling, ending at the total"""
+        reports = []
+        with ProgressReporter(reports.append, interval=0):
+            sequence_alignment(X, Y, DELTA, ALPHA)
+
+        assert len(reports) == len(X) + 1
+        assert [r['done'] for r in reports[:-1]] == [len(Y) * i for i in range(1, len(X) + 1)]
+        assert reports[-1]['final']
+        assert reports[-1]['done'] == reports[-1]['total'] == len(X) * len(Y)
+        assert reports[-1]['fraction'] == 1.0
+
+    def test_throttled(self):
+        """Test that a long interval leaves only the final report"""
+        reports = []
+        with ProgressReporter(reports.append, interval=3600):
+            sequence_alignment(X, Y, DELTA, ALPHA)
+        assert [r['final'] for r in reports] == [True]
+
+    def test_hirschberg_estimate(self):
+        """Test that the expected cells are close to the cells Hirschberg evaluates"""
+        for align, budget in ((hirschberg, 0), (iterative_hirschberg, 1000)):
+            reports = []
+            with ProgressReporter(reports.append, interval=3600):
+                if budget:
+                    align(X, Y, DELTA, ALPHA, cell_budget=budget)
+                else:
+                    align(X, Y, DELTA, ALPHA)
+            final = reports[-1]
+            assert final['total'] == expected_cells(len(X), len(Y), budget)
+            assert abs(final['fraction'] - 1) < 0.05
+
+
+class TestFormats:
+    """Test the stderr progress formats"""
+
+    def test_json(self, capsys):
+        """Test one parseable JSON object per report"""
+        print_json({'done': 5, 'total': 10, 'fraction': 0.5, 'eta_s': 1.0, 'final': False})
+        assert json.loads(capsys.readouterr().err)['fraction'] == 0.5
+
+    def test_text(self, capsys):
+        """Test that only the final status line ends the line"""
+        report = {'done': 5, 'total': 10, 'fraction': 0.5, 'elapsed_s': 61.0, 'cells_per_s': 1.0,
+                  'eta_s': None, 'final': False}
+        print_text(report)
+        print_text({**report, 'done': 10, 'fraction': 1.0, 'eta_s': 0.0, 'final': True})
+        err = capsys.readouterr().err
+        assert err.count("\n") == 1
+        assert "50.0%" in err and "0:01:01" in err and "ETA ?" in err
+
+
+class TestEngines:
+    """Test that every engine reports its progress"""
+
+    @pytest.mark.parametrize("name", sorted(basic.ENGINES))
+    def test_basic_engines(self, name):
+        """Test that each basic engine reaches its expected total"""
+        reports = []
+        with ProgressReporter(reports.append, interval=0):
+            basic.ENGINES[name](X, Y, DELTA, ALPHA)
+
+        assert len(reports) > 2
+        done = [r['done'] for r in reports]
+        assert done == sorted(done)
+        assert reports[-1]['final'] and reports[-1]['done'] == reports[-1]['total'] > 0
+
+    def test_parallel(self):
+        """Test that the pool's tasks are counted in the parent"""
+        reports = []
+        with ProgressReporter(reports.append, interval=3600):
+            parallel_hirschberg(X, Y, DELTA, ALPHA, workers=2, cell_budget=256)
+        assert [r['final'] for r in reports] == [True]
+        assert abs(reports[-1]['fraction'] - 1) < 0.05
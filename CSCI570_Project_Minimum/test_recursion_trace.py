@@ -0,0 +1,76 @@
+import json
+
+from basic import DELTA, ALPHA
+from efficient import hirschberg, iterative_hirschberg
+from recursion_trace import RecursionTracer, read_trace, summarize
+
+X = "ACACTGACTACTGACTGGTGACTACTGACTGG" * 4
+Y = "TATTATACGCTATTATACGCGACGCGGACGCG" * 4
+
+
+class TestRecursionTracer:
+    """Test the recorded recursion nodes"""
+
+    def test_disabled(self):
+        """Test that no tracer is active outside the with-block"""
+        with RecursionTracer() as tracer:
+            assert RecursionTracer.active() is tracer
+        assert RecursionTracer.active() is None
+        hirschberg(X, Y, DELTA, ALPHA)
+        assert tracer.nodes == []
+
+    def test_hirschberg_nodes(self):
+        """Test the root, the split columns and the depth of the children"""
+        with RecursionTracer() as tracer:
+            hirschberg(X, Y, DELTA, ALPHA)
+
+        root = tracer.nodes[0]
+        assert (root['depth'], root['m'], root['n']) == (0, len(X), len(Y))
+        assert 0 <= root['k'] <= len(Y)
+        assert all(node['cells'] == node['m'] * node['n'] for node in tracer.nodes)
+        assert all(node['k'] is None for node in tracer.nodes if node['m'] <= 2 or node['n'] <= 2)
+
+        # the children of the root split x in half at its split column
+        children = [node for node in tracer.nodes if node['depth'] == 1]
+        assert [(c['xlo'], c['ylo'], c['yhi']) for c in children] == [(0, 0, root['k']),
+                                                                      (len(X) // 2, root['k'], len(Y))]
+
+    def test_iterative_matches_recursive(self):
+        """Test that a zero cell budget traces the same tree"""
+        with RecursionTracer() as recursive:
+            hirschberg(X, Y, DELTA, ALPHA)
+        with RecursionTracer() as iterative:
+            iterative_hirschberg(X, Y, DELTA, ALPHA, cell_budget=0)
+
+        def shape(nodes):
+            return sorted((n['depth'], n['xlo'], n['xhi'], n['ylo'], n['yhi'], n['k']) for n in nodes)
+
+        assert shape(recursive.nodes) == shape(iterative.nodes)
+
+    def test_json_lines(self, tmp_path):
+        """Test that the file holds one line per node"""
+        path = str(tmp_path / "trace.jsonl")
+        with RecursionTracer(path) as tracer:
+            hirschberg(X, Y, DELTA, ALPHA)
+        assert read_trace(path) == json.loads(json.dumps(tracer.nodes))
+
+
+class TestSummarize:
+    """Test work per depth and the recomputation factor"""
+
+    def test_factor_near_two(self):
+        """Test that Hirschberg evaluates about twice the m * n cells"""
+        with RecursionTracer() as tracer:
+            hirschberg(X, Y, DELTA, ALPHA)
+        summary = tracer.summary()
+
+        assert summary['root_cells'] == len(X) * len(Y)
+        assert 1.5 < summary['factor'] <= 2.0
+        assert [level['depth'] for level in summary['depths']] == list(range(len(summary['depths'])))
+        assert sum(level['nodes'] for level in summary['depths']) == summary['nodes']
+
+    def test_empty(self):
+        """Test a trace with no nodes, e.g. a cache hit"""
+        summary = summarize([])
+        assert summary['nodes'] == 0
+        assert summary['factor'] is None
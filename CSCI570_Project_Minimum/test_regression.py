@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from regression import compare, main, print_rows, summarize
+
+
+def make_report(results, timestamp="2026-01-01T00:00:00"):
+    return {'meta': {'timestamp': timestamp, 'commit': "abc123"}, 'results': results}
+
+
+def make_result(wall_s, peak_kb=1000.0, engine="basic:dp", size=1024):
+    return {'engine': engine, 'm': size, 'n': size, 'cells': size * size, 'wall_s': wall_s, 'peak_kb': peak_kb}
+
+
+class TestSummarize:
+    """Test the robust statistics"""
+
+    def test_median_and_iqr(self):
+        """Test the quartiles and that the interval holds the median"""
+        summary = summarize([1, 2, 3, 4, 100])
+        assert summary['median'] == 3
+        assert (summary['q1'], summary['q3']) == (2, 4)
+        assert summary['ci_low'] <= summary['median'] <= summary['ci_high']
+
+    def test_no_samples(self):
+        """Test that an empty sample list has no summary"""
+        assert summarize([]) is None
+
+    def test_single_sample(self):
+        """Test a result with a single repeat"""
+        summary = summarize([5.0])
+        assert summary['median'] == summary['ci_low'] == summary['ci_high'] == 5.0
+        assert summary['iqr'] == 0
+
+
+class TestCompare:
+    """Test the regression verdicts"""
+
+    def test_clear_slowdown(self):
+        """Test that a consistent 2x slowdown is a regression"""
+        baseline = make_report([make_result([0.10, 0.11, 0.10, 0.12, 0.10])])
+        current = make_report([make_result([0.20, 0.21, 0.20, 0.22, 0.20])])
+        [row] = compare(current, baseline)
+        assert row['status'] == 'regression' and row['problems'] == ['slower']
+        assert row['speed_change'] < -0.4
+
+    def test_noise_is_not_a_regression(self):
+        """Test that overlapping intervals pass even with a lower median"""
+        baseline = make_report([make_result([0.10, 0.16, 0.10, 0.15, 0.11])])
+        current = make_report([make_result([0.12, 0.10, 0.15, 0.16, 0.12])])
+        [row] = compare(current, baseline)
+        assert row['status'] == 'ok'
+
+    def test_speedup_and_new(self):
+        """Test faster results and results missing from the baseline"""
+        baseline = make_report([make_result([0.2] * 5)])
+        current = make_report([make_result([0.1] * 5), make_result([0.1] * 5, engine="basic:packed")])
+        rows = compare(current, baseline)
+        assert [row['status'] for row in rows] == ['faster', 'new']
+
+    def test_short_runs_not_gated(self):
+        """Test that runs below the minimum wall time only get reported"""
+        baseline = make_report([make_result([0.002] * 5, size=64)])
+        current = make_report([make_result([0.004] * 5, size=64)])
+        [row] = compare(current, baseline)
+        assert row['status'] == 'short' and row['speed_change'] < -0.4
+
+    def test_untimed(self):
+        """Test that results without measurable time are reported, not gated"""
+        baseline = make_report([make_result([0.0] * 5, 1000.0), make_result([0.1] * 5, size=64)])
+        current = make_report([make_result([0.0] * 5, 1500.0), make_result([], size=64)])
+        rows = compare(current, baseline)
+        assert [row['status'] for row in rows] == ['regression', 'untimed']
+        assert rows[0]['problems'] == ['more memory']
+        assert rows[1]['cells_per_s'] is None and 'speed_change' not in rows[1]
+        print_rows(rows)
+
+    def test_memory_growth(self):
+        """Test the memory threshold and its noise floor"""
+        baseline = make_report([make_result([0.1] * 5, 1000.0), make_result([0.1] * 5, 100.0, size=64)])
+        current = make_report([make_result([0.1] * 5, 1500.0), make_result([0.1] * 5, 150.0, size=64)])
+        rows = compare(current, baseline)
+        assert rows[0]['problems'] == ['more memory']
+        assert rows[1]['status'] == 'ok'
+
+
+class TestCli:
+    """Test the gate's exit status and report"""
+
+    def write(self, path, report):
+        path.write_text(json.dumps(report))
+        return str(path)
+
+    def test_exit_status(self, tmp_path, monkeypatch):
+        """Test that a regression exits non-zero"""
+        baseline = self.write(tmp_path / "baseline.json", make_report([make_result([0.1] * 5)]))
+        slow = self.write(tmp_path / "slow.json", make_report([make_result([0.3] * 5)]))
+        same = self.write(tmp_path / "same.json", make_report([make_result([0.1] * 5)]))
+
+        for results, status in [(slow, 1), (same, 0)]:
+            monkeypatch.setattr("sys.argv", ["regression.py", results, "--baseline", baseline])
+            with pytest.raises(SystemExit) as exit_info:
+                main()
+            assert exit_info.value.code == status
+
+    def test_nothing_to_do(self, monkeypatch, capsys):
+        """Test that running without results or history prints usage and fails"""
+        monkeypatch.setattr("sys.argv", ["regression.py"])
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code != 0
+        assert "usage" in capsys.readouterr().err
+
+    def test_trend_report(self, tmp_path):
+        """Test rendering the history"""
+        pytest.importorskip("plotly")
+        from regression import trend_report
+
+        paths = [self.write(tmp_path / f"run{k}.json", make_report([make_result([0.1 * (k + 1)] * 3)],
+                                                                    f"2026-01-0{k + 1}T00:00:00"))
+                 for k in range(3)]
+        fig = trend_report(paths, str(tmp_path / "trend.html"))
+        assert len(fig.data) == 2
+        assert (tmp_path / "trend.html").exists()
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from basic import DELTA, ALPHA, generate_string, sequence_alignment, parse_args
+from repeats import repeat_alignment
+from sequence import VirtualSequence
+
+
+class TestPhraseCuts:
+    """Test splitting generated sequences into repeated phrases"""
+
+    @pytest.mark.parametrize("size", [1, 2, 4, 16])
+    def test_cuts_cover_sequence(self, size):
+        """Test that cuts run from 0 to len in steps of at most size"""
+        sequence = VirtualSequence("ACGTTGCA", [7, 15, 3, 31, 0, 12])
+        cuts = sequence.phrase_cuts(size)
+        assert cuts[0] == 0 and cuts[-1] == len(sequence)
+        assert all(0 < b - a <= size for a, b in zip(cuts, cuts[1:]))
+
+    def test_few_distinct_phrases(self):
+        """Test that the phrases are drawn from a small set"""
+        sequence = VirtualSequence("ACGTTGCATC", [7, 15, 3, 31, 0, 12, 90, 255])
+        cuts = sequence.phrase_cuts(4)
+        phrases = {sequence[a:b] for a, b in zip(cuts, cuts[1:])}
+        assert len(phrases) < 30 < len(cuts)
+
+
+class TestRepeatAlignment:
+    """Test the repeat-aware engine"""
+
+    def test_known_example(self):
+        """Test with the provided example"""
+        string1 = VirtualSequence("ACTG", [3, 6, 1, 1])
+        string2 = VirtualSequence("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = repeat_alignment(string1, string2, DELTA, ALPHA)
+        assert cost == 1296
+        assert (cost, aligned1, aligned2) == sequence_alignment(string1, string2, DELTA, ALPHA)
+
+    def test_empty_strings(self):
+        """Test with empty and one-sided inputs"""
+        assert repeat_alignment("", "", DELTA, ALPHA) == (0, "", "")
+        assert repeat_alignment("ACG", "", DELTA, ALPHA) == (3 * DELTA, "ACG", "___")
+        assert repeat_alignment("", VirtualSequence("AC", [0]), DELTA, ALPHA) == (4 * DELTA, "____", "AACC")
+
+    @pytest.mark.parametrize("phrase", [1, 3, 4])
+    def test_matches_basic_traceback(self, phrase):
+        """Test random generated inputs against the basic alignment"""
+        rng = random.Random(phrase)
+        for _ in range(10):
+            specs = []
+            for _ in range(2):
+                base = ''.join(rng.choice("ACGT") for _ in range(rng.randint(1, 6)))
+                indices = []
+                for _ in range(rng.randint(0, 3)):
+                    indices.append(rng.randrange(len(base) << len(indices)))
+                specs.append((base, indices))
+            string1, string2 = (VirtualSequence(base, indices) for base, indices in specs)
+            assert repeat_alignment(string1, string2, DELTA, ALPHA, phrase) == \
+                sequence_alignment(generate_string(*specs[0]), generate_string(*specs[1]), DELTA, ALPHA)
+
+    def test_computes_fewer_cells(self):
+        """Test that repeats cut the computed cells well below m * n"""
+        string1 = VirtualSequence("GTCTGATCTACCCGAAG", [14, 58, 3, 100, 7, 250])
+        string2 = VirtualSequence("TTGACGGCATTCAGC", [9, 40, 1, 88, 200, 31])
+        stats = {}
+        cost = repeat_alignment(string1, string2, DELTA, ALPHA, stats=stats).cost
+        assert cost == sequence_alignment(string1, string2, DELTA, ALPHA).cost
+        assert stats["cells"] < len(string1) * len(string2) / 4
+
+    def test_cli_engine(self):
+        """Test selecting the engine from the CLI"""
+        assert parse_args(["in.txt", "out.txt", "--engine", "repeats"]).engine == "repeats"
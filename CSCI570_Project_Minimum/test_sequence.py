@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+import sequence
+from basic import generate_string
+from encoding import cost_matrix, encode
+from sequence import VirtualSequence
+
+
+SPECS = [
+    ("ACTG", [3, 6, 1, 1]),
+    ("TACG", [1, 2, 9, 2]),
+    ("A", []),
+    ("GT", [5, 0, 100]),
+    ("ACGTTGCA", [7, 15, 3, 31, 0, 12, 90, 255, 4, 600]),
+]
+
+
+class TestVirtualSequence:
+    """Test the lazily generated sequence"""
+
+    @pytest.mark.parametrize("base, indices", SPECS)
+    def test_matches_generate_string(self, base, indices):
+        """Test length, equality and materializing against generate_string"""
+        virtual = VirtualSequence(base, indices)
+        expected = generate_string(base, indices)
+        assert len(virtual) == len(expected)
+        assert virtual == expected
+        assert expected == virtual
+        assert virtual.materialize() == expected
+
+    @pytest.mark.parametrize("base, indices", SPECS)
+    def test_random_access(self, base, indices):
+        """Test single characters and slices"""
+        virtual = VirtualSequence(base, indices)
+        expected = generate_string(base, indices)
+        rng = random.Random(1)
+        for _ in range(50):
+            p = rng.randrange(len(expected))
+            assert virtual[p] == expected[p]
+            lo, hi = sorted(rng.randrange(len(expected) + 1) for _ in range(2))
+            assert virtual[lo:hi] == expected[lo:hi]
+        assert virtual[-1] == expected[-1]
+        assert virtual[::3] == expected[::3]
+        with pytest.raises(IndexError):
+            virtual[len(expected)]
+
+    def test_deep_levels_without_cache(self, monkeypatch):
+        """Test the recursive walk when no level is small enough to cache"""
+        monkeypatch.setattr(sequence, "LEVEL_CACHE", 0)
+        base, indices = SPECS[-1]
+        virtual = VirtualSequence(base, indices)
+        expected = generate_string(base, indices)
+        assert virtual[1000:5000] == expected[1000:5000]
+        chunks = list(virtual.iter_chunks(chunk_size=1000))
+        assert ''.join(chunks) == expected
+        assert all(len(chunk) >= 1000 for chunk in chunks[:-1])
+
+    def test_encodes_like_str(self):
+        """Test that engines can encode it directly"""
+        alphabet, _ = cost_matrix({('A', 'C'): 0, ('G', 'T'): 0})
+        virtual = VirtualSequence("ACTG", [3, 6, 1, 1])
+        assert encode(virtual, alphabet) == encode(str(virtual), alphabet)
+
+    def test_not_equal(self):
+        """Test sequences that differ in length or content"""
+        virtual = VirtualSequence("ACTG", [3, 6])
+        assert virtual != "ACTG"
+        assert virtual != generate_string("ACTG", [3, 5])
+        assert virtual == VirtualSequence("ACTG", [3, 6])
+        assert virtual != 5
@@ -0,0 +1,120 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from basic import DELTA, ALPHA, generate_string, sequence_alignment
+from server import AlignmentServer, align_request, percentile, worker_caches
+
+
+def post(url, payload):
+    request = urllib.request.Request(url + "/align", data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = AlignmentServer(workers=2, max_pending=8)
+    server.start()
+    yield server
+    server.close()
+
+
+class TestAlignmentServer:
+    """Test the localhost alignment server end to end"""
+
+    def test_align_sequences(self, server):
+        """Test aligning two sequences sent inline"""
+        status, result = post(server.url, {"x": "ACTGACTG", "y": "TACGTACG"})
+        expected = sequence_alignment("ACTGACTG", "TACGTACG", DELTA, ALPHA)
+        assert status == 200
+        assert (result["cost"], result["aligned_x"], result["aligned_y"]) == tuple(expected)
+        assert result["latency_ms"] >= result["compute_ms"] >= 0
+        assert result["queue_ms"] >= 0
+
+    def test_align_spec(self, server):
+        """Test an input-file spec with a chosen engine and CIGAR output"""
+        status, result = post(server.url, {"spec": "ACTG\n3\n6\n1\n1\nTACG\n1\n2\n9\n2\n", "mode": "efficient",
+                                           "options": ["--engine", "iterative"], "format": "cigar"})
+        expected = sequence_alignment(generate_string("ACTG", [3, 6, 1, 1]),
+                                      generate_string("TACG", [1, 2, 9, 2]), DELTA, ALPHA)
+        assert status == 200
+        assert result["cost"] == 1296
+        assert result["cigar"] == expected.cigar()
+
+    @pytest.mark.parametrize("payload", [
+        {"x": "ACGT"},
+        {"x": "ACGT", "y": "AC", "mode": "fast"},
+        {"x": "ACGT", "y": "AC", "options": ["--engine", "nope"]},
+        {"spec": "ACGT\n"},
+        {"x": "ACGT", "y": "AC", "options": ["--profile", "p.json"]},
+        {"x": "ACGT", "y": "AC", "options": ["--progress", "json"]},
+        {"x": "ACGT", "y": "AC", "mode": "efficient", "options": ["--trace", "t.jsonl"]},
+        {"x": "ACGT", "y": "AC", "mode": "efficient", "options": ["--engine", "iterative", "--workers", "2"]},
+        ["ACGT", "AC"],
+    ])
+    def test_bad_requests(self, server, payload):
+        """Test that malformed requests get 400"""
+        status, result = post(server.url, payload)
+        assert status == 400 and "error" in result
+
+    def test_engine_errors(self, server):
+        """Test that failures inside a worker get 500"""
+        status, result = post(server.url, {"x": "ACXT", "y": "AC"})
+        assert status == 500 and "ValueError" in result["error"]
+
+    def test_stats(self, server):
+        """Test the latency report"""
+        post(server.url, {"x": "A", "y": "C"})
+        with urllib.request.urlopen(server.url + "/stats") as response:
+            stats = json.loads(response.read())
+        assert stats["completed"] >= 1
+        assert stats["latency_ms"]["50"] <= stats["latency_ms"]["99"]
+
+
+def test_worker_cache(tmp_path):
+    """Test that requests with --cache share one open cache per file"""
+    options = ["--cache", str(tmp_path / "cache.db")]
+    first = align_request("basic", options, "ACGTAC", "TGCA", "cigar")
+    second = align_request("basic", options, "ACGTAC", "TGCA", "cigar")
+    cache = worker_caches[options[1]]
+    assert first["cigar"] == second["cigar"]
+    assert (cache.misses, cache.hits) == (1, 1)
+    cache.close()
+    del worker_caches[options[1]]
+
+
+class TestAdmission:
+    """Test the bounded queue"""
+
+    def test_rejects_when_full(self):
+        """Test that requests beyond max_pending get 503"""
+        server = AlignmentServer(workers=1, max_pending=1)
+        server.start()
+        try:
+            slow = {"x": "ACGT" * 300, "y": "TGCA" * 300}
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(post(server.url, slow)[0]))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert 200 in results and 503 in results
+            assert server.service.stats()["rejected"] == results.count(503)
+        finally:
+            server.close()
+
+
+def test_percentile():
+    """Test the nearest-rank percentile"""
+    assert percentile([], 50) == 0.0
+    assert percentile([1, 2, 3, 4], 50) == 3
+    assert percentile([1, 2, 3, 4], 99) == 4
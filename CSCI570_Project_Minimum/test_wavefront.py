@@ -0,0 +1,38 @@
+from basic import DELTA, ALPHA, generate_string, sequence_alignment, parse_args
+from wavefront import wavefront_alignment
+
+
+class TestWavefrontAlignment:
+    """Test the anti-diagonal numpy engine against the basic DP"""
+
+    def test_empty_strings(self):
+        """Test with empty strings"""
+        assert wavefront_alignment("", "", DELTA, ALPHA) == (0, "", "")
+
+    def test_one_empty_string(self):
+        """Test with one empty string on either side"""
+        assert wavefront_alignment("AC", "", DELTA, ALPHA) == (2 * DELTA, "AC", "__")
+        assert wavefront_alignment("", "AC", DELTA, ALPHA) == (2 * DELTA, "__", "AC")
+
+    def test_known_example(self):
+        """Test with the provided example"""
+        string1 = generate_string("ACTG", [3, 6, 1, 1])
+        string2 = generate_string("TACG", [1, 2, 9, 2])
+
+        cost, aligned1, aligned2 = wavefront_alignment(string1, string2, DELTA, ALPHA)
+        assert cost == 1296
+        assert (cost, aligned1, aligned2) == sequence_alignment(string1, string2, DELTA, ALPHA)
+
+
+class TestEngineSelection:
+    """Test the --engine switch of the basic CLI"""
+
+    def test_default_engine(self):
+        """Test that the plain DP stays the default"""
+        args = parse_args(["in.txt", "out.txt"])
+        assert args.engine == "dp"
+
+    def test_wavefront_engine(self):
+        """Test selecting the wavefront engine"""
+        args = parse_args(["in.txt", "out.txt", "--engine", "wavefront"])
+        assert args.engine == "wavefront"
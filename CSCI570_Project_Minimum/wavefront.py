@@ -0,0 +1,99 @@
+import numpy as np
+
+from alignment import MATCH, GAP_X, GAP_Y, Alignment, ops_from_moves
+from encoding import cost_matrix, encode
+from phases import count, phase
+from progress import ProgressReporter, expect
+
+
+def wavefront_alignment(X, Y, delta, alpha) -> Alignment:
+    """
+    Sequence alignment that fills the DP table one anti-diagonal at a time.
+    Every cell on the diagonal i + j = d only depends on diagonals d - 1 and
+    d - 2, so a whole diagonal is computed with a handful of numpy operations.
+    Produces the same cost and the same diagonal > left > up traceback as
+    basic.sequence_alignment.
+    """
+    m, n = len(X), len(Y)
+
+    alphabet, costs = cost_matrix(alpha)
+    x_bytes = encode(X, alphabet)
+    y_bytes = encode(Y, alphabet)
+
+    if m == 0 or n == 0:
+        ops = [[GAP_Y, m]] if m else [[GAP_X, n]] if n else []
+        return Alignment(ops, x_bytes, y_bytes, alphabet, delta, costs, (m + n) * delta)
+
+    cost = np.array(costs, dtype=np.int64)
+    x_codes = np.frombuffer(x_bytes, dtype=np.uint8).astype(np.intp)
+    y_codes_reversed = np.frombuffer(y_bytes, dtype=np.uint8)[::-1].astype(np.intp)
+    flat_cost = cost.ravel()
+    k = len(alphabet)
+
+    # Costs never exceed (m + n) * max step, so int32 is enough unless the
+    # inputs are enormous
+    max_step = max(delta, int(cost.max()))
+    dtype = np.int32 if (m + n) * max_step < np.iinfo(np.int32).max else np.int64
+
+    dp = np.empty((m + 1, n + 1), dtype=dtype)
+
+    # base cases
+    dp[:, 0] = np.arange(m + 1) * delta
+    dp[0, :] = np.arange(n + 1) * delta
+
+    with phase('fill'):
+        # In row-major order cell (i, d - i) sits at flat index d + i * n, so the
+        # cells of one anti-diagonal are a strided view with step n, and so are
+        # their diagonal, up and left neighbours
+        flat = dp.ravel()
+        expect(m * n)
+        reporter = ProgressReporter.active()
+        for d in range(2, m + n + 1):
+            lo = max(1, d - n)
+            hi = min(m, d - 1)
+            start = d + lo * n
+            stop = d + hi * n + 1
+
+            # X[i - 1] for i in lo..hi and Y[d - i - 1], read from the reversed Y
+            pair_cost = flat_cost[x_codes[lo - 1:hi] * k + y_codes_reversed[n - d + lo:n - d + hi + 1]]
+
+            cells = flat[start:stop:n]
+            np.add(flat[start - n - 2:stop - n - 2:n], pair_cost, out=cells, casting='unsafe')
+            np.minimum(cells, flat[start - n - 1:stop - n - 1:n] + delta, out=cells)
+            np.minimum(cells, flat[start - 1:stop - 1:n] + delta, out=cells)
+            if reporter:
+                reporter.advance(hi - lo + 1)
+        count('cells', m * n)
+
+    minimum_alignment_cost = int(dp[m, n])
+
+    # moves are found back to front
+    moves = []
+
+    with phase('traceback'):
+        i, j = m, n
+        while i > 0 or j > 0:
+            if i == 0:
+                moves.append(GAP_X)
+                j -= 1
+            elif j == 0:
+                moves.append(GAP_Y)
+                i -= 1
+            else:
+                current = dp.item(i, j)
+
+                # Diagonal
+                if current == dp.item(i - 1, j - 1) + costs[x_bytes[i - 1]][y_bytes[j - 1]]:
+                    moves.append(MATCH)
+                    i -= 1
+                    j -= 1
+                # Left
+                elif current == dp.item(i, j - 1) + delta:
+                    moves.append(GAP_X)
+                    j -= 1
+                # Up
+                else:
+                    moves.append(GAP_Y)
+                    i -= 1
+
+    return Alignment(ops_from_moves(moves), x_bytes, y_bytes, alphabet, delta, costs, minimum_alignment_cost)